@@ -2,9 +2,12 @@
 
 import os
 import sqlite3
+from typing import Optional
 
 import click  # Add click import for CLI commands
-from flask import Flask
+from flask import Flask, g
+
+from src.config import ensure_instance_folder
 
 app: Flask = Flask(
     __name__, instance_path=None
@@ -41,9 +44,9 @@ def hello() -> str:
 # Or using sqlite3 directly:
 
 
-def get_db_connection() -> sqlite3.Connection:
-    # Ensure the database path from config is absolute or correctly resolved
-    db_path = app.config["SQLALCHEMY_DATABASE_URI"].replace("sqlite:///", "")
+def _get_db_path() -> str:
+    """Returns the filesystem path of the configured SQLite database."""
+    db_path: str = app.config["SQLALCHEMY_DATABASE_URI"].replace("sqlite:///", "")
     if not os.path.isabs(db_path):
         # Assuming INSTANCE_FOLDER in config.py is an absolute path or relative to
         # BASE_DIR
@@ -52,14 +55,79 @@ def get_db_connection() -> sqlite3.Connection:
         # For now, we assume it's an absolute path or correctly relative path that
         # sqlite3.connect can handle.
         pass  # If it's not absolute, sqlite3 will create it relative to CWD of `flask run` or `python run.py`  # noqa: E501
+    return db_path
 
-    conn = sqlite3.connect(db_path)
+
+# Applied to each connection get_db_connection opens; WAL keeps readers from
+# blocking on a writer, and NORMAL syncing is durable under WAL.
+SQLITE_PRAGMAS = (
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+)
+
+
+def get_db_connection() -> sqlite3.Connection:
+    """Returns the database connection of the current app context.
+
+    The connection is opened on first use and reused until the app context is torn
+    down, where close_db_connection closes it. Callers must not close it
+    themselves, since later calls in the same context would get a closed
+    connection.
+    """
+    if "db_conn" in g:
+        conn: sqlite3.Connection = g.db_conn
+        return conn
+
+    conn = sqlite3.connect(_get_db_path())
     conn.row_factory = sqlite3.Row
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(pragma)
+    g.db_conn = conn
     return conn
 
 
+@app.teardown_appcontext
+def close_db_connection(exception: Optional[BaseException]) -> None:
+    """Closes the app context's database connection, if one was opened."""
+    conn: Optional[sqlite3.Connection] = g.pop("db_conn", None)
+    if conn is not None:
+        conn.close()
+
+
+# STRICT does not allow the TIMESTAMP type, so date_added is TEXT; it keeps the
+# CURRENT_TIMESTAMP default.
+_DOCUMENTS_TABLE_DDL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id TEXT PRIMARY KEY,
+        title TEXT NOT NULL,
+        author TEXT,
+        pub_date TEXT,
+        doc_type TEXT NOT NULL,
+        date_added TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        file_path TEXT NOT NULL
+    ) WITHOUT ROWID, STRICT
+"""
+
+
+def _rebuild_legacy_documents_table(conn: sqlite3.Connection) -> None:
+    """Copies a documents table created by older versions of init_db into a STRICT,
+    WITHOUT ROWID table, which ALTER TABLE cannot convert it to."""
+    conn.execute(_DOCUMENTS_TABLE_DDL.format(table="documents_strict"))
+    conn.execute(
+        """
+        INSERT INTO documents_strict
+            (id, title, author, pub_date, doc_type, date_added, file_path)
+        SELECT id, title, author, pub_date, doc_type, date_added, file_path
+        FROM documents
+        """
+    )
+    conn.execute("DROP TABLE documents")
+    conn.execute("ALTER TABLE documents_strict RENAME TO documents")
+
+
 def init_db() -> None:
-    db_path = app.config["SQLALCHEMY_DATABASE_URI"].replace("sqlite:///", "")
+    db_path = _get_db_path()
     # Ensure instance directory exists before trying to connect/create DB
     instance_dir = os.path.dirname(db_path)
     if not os.path.exists(instance_dir):
@@ -67,21 +135,18 @@ def init_db() -> None:
         print(f"Created instance directory: {instance_dir}")
 
     conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-
-    cursor.executescript("""
-        CREATE TABLE IF NOT EXISTS documents (
-            id TEXT PRIMARY KEY,
-            title TEXT NOT NULL,
-            author TEXT,
-            pub_date TEXT, 
-            doc_type TEXT NOT NULL,
-            date_added TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            file_path TEXT NOT NULL
-        );
-    """)
-    conn.commit()
-    conn.close()
+    try:
+        # Databases created before the table became STRICT and WITHOUT ROWID are
+        # rebuilt in the same transaction, so the two schemas don't coexist.
+        conn.execute("BEGIN")
+        with conn:
+            # Columns of PRAGMA table_list: schema, name, type, ncol, wr, strict.
+            table_info = conn.execute("PRAGMA table_list('documents')").fetchone()
+            if table_info is not None and not (table_info[4] and table_info[5]):
+                _rebuild_legacy_documents_table(conn)
+            conn.execute(_DOCUMENTS_TABLE_DDL.format(table="documents"))
+    finally:
+        conn.close()
     # click.echo will print to console when CLI command is run
     # print(f"Database initialized at {db_path}") # Use click.echo for CLI commands
 
@@ -90,5 +155,6 @@ def init_db() -> None:
 @app.cli.command("init-db")
 def init_db_command() -> None:
     """Clear existing data and create new tables."""
+    ensure_instance_folder()
     init_db()
     click.echo("Initialized the database.")
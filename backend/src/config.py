@@ -5,14 +5,20 @@ import os
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 INSTANCE_FOLDER = os.path.join(BASE_DIR, "instance")
 
-# Ensure the instance folder exists
-if not os.path.exists(INSTANCE_FOLDER):
-    os.makedirs(INSTANCE_FOLDER)
-
 # SQLite database configuration
 DATABASE_NAME = "metadata.db"
 SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(INSTANCE_FOLDER, DATABASE_NAME)}"
 
+
+def ensure_instance_folder() -> None:
+    """Creates the instance folder if it does not exist yet.
+
+    Called by the init-db command rather than on import, so importing the config
+    or the app has no filesystem side effects.
+    """
+    os.makedirs(INSTANCE_FOLDER, exist_ok=True)
+
+
 # Other configurations can be added here
 # For example:
 # SECRET_KEY = os.environ.get('SECRET_KEY', 'a_default_secret_key')
@@ -1,11 +1,19 @@
 from .sqlite_metadata_store import (
+    CONNECTION_PRAGMAS,
     SQLiteMetadataStore,
+    SQLiteReadPool,
+    apply_connection_pragmas,
+    close_db_connections,
     create_metadata_tables,
     get_db_connection,
 )
 
 __all__ = [
+    "CONNECTION_PRAGMAS",
     "SQLiteMetadataStore",
+    "SQLiteReadPool",
+    "apply_connection_pragmas",
+    "close_db_connections",
     "create_metadata_tables",
     "get_db_connection",
 ]
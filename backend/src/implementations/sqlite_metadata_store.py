@@ -1,13 +1,32 @@
 import asyncio
+import contextlib
+import functools
 import logging
 import os
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+import weakref
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from urllib.parse import parse_qsl, urlencode
+from urllib.request import pathname2url
 
 import aiosqlite
 
 from ..interfaces import MetadataStore
-from ..models import Document, DocumentType
+from ..models import Document, DocumentType, datetime_to_epoch_us
+from .sqlite_rows import (
+    FILTER_HANDLERS,
+    document_to_row,
+    row_to_document,
+)
 
 # Set up logger for this module
 logger = logging.getLogger(__name__)
@@ -25,6 +44,141 @@ DATABASE_URL: str = os.environ.get(
     "METADATA_DATABASE_URL", f"sqlite:///{DEFAULT_DB_PATH}"
 )
 
+# Connection tuning applied right after every connect. WAL lets readers run while a
+# writer commits, and synchronous=NORMAL is still durable under WAL while sparing
+# an fsync per commit. busy_timeout goes first so the journal-mode switch waits on
+# other connections instead of failing with SQLITE_BUSY.
+CONNECTION_PRAGMAS: Tuple[str, ...] = (
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Read-only connections each store keeps next to its writer connection.
+READ_POOL_SIZE: int = 4
+
+# The journal mode belongs to the database file and is set by the writer; a
+# read-only connection cannot change it.
+_READ_ONLY_PRAGMAS: Tuple[str, ...] = tuple(
+    pragma for pragma in CONNECTION_PRAGMAS if "journal_mode" not in pragma
+)
+
+# add_document_metadata commits a row straight away when no commit is in flight.
+# Rows that arrive while one is are committed together once it finishes, at most
+# WRITE_BATCH_MAX_ROWS per executemany().
+WRITE_BATCH_MAX_ROWS: int = 64
+
+# Ids per `WHERE id IN (...)` query, kept under SQLite's historical limit of 999
+# host parameters per statement.
+MAX_IDS_PER_QUERY: int = 500
+
+# Rows iter_documents_metadata reads per query. The read connection is returned
+# to the pool between chunks, so consumers may do other reads while streaming.
+ITER_CHUNK_SIZE: int = 256
+
+# Size of the per-connection prepared statement cache (sqlite3 defaults to 128).
+STATEMENT_CACHE_SIZE: int = 256
+
+# Fixed column order shared by every read, so row_to_document can unpack rows
+# positionally instead of looking each column up by name.
+_DOCUMENT_COLUMNS = (
+    "id, title, author, publication_date, document_type, date_added, file_path"
+)
+
+# SQL is kept in module-level constants so every call hands the driver the very same
+# string and hits its prepared statement cache.
+_SQL_INSERT = (
+    f"INSERT INTO documents ({_DOCUMENT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+_SQL_SELECT = f"SELECT {_DOCUMENT_COLUMNS} FROM documents"
+_SQL_GET_ONE = f"{_SQL_SELECT} WHERE id = ?"
+_SQL_GET_MANY_TMPL = _SQL_SELECT + " WHERE id IN ({placeholders})"
+_SQL_UPDATE_TMPL = "UPDATE documents SET {assignments} WHERE id = ?"
+_SQL_DELETE = "DELETE FROM documents WHERE id = ?"
+
+# Columns update_document_metadata may change.
+_UPDATABLE_COLUMNS: FrozenSet[str] = frozenset(
+    {"title", "author", "publication_date", "document_type", "file_path"}
+)
+
+
+def _update_columns(updates: Dict[str, Any]) -> Tuple[str, ...]:
+    """Returns the updatable columns present in updates, in sorted order so equal
+    column sets always render (and cache) the same UPDATE statement."""
+    return tuple(sorted(updates.keys() & _UPDATABLE_COLUMNS))
+
+
+# Columns list_documents_metadata accepts as sort keys.
+_SORT_COLUMNS: FrozenSet[str] = frozenset(
+    {"id", "title", "author", "publication_date", "document_type", "date_added"}
+)
+
+# Position of each column in rows selected with _DOCUMENT_COLUMNS.
+_COLUMN_POSITIONS: Dict[str, int] = {
+    column.strip(): position
+    for position, column in enumerate(_DOCUMENT_COLUMNS.split(","))
+}
+
+
+def _after_row_condition(
+    sort_by: str, descending: bool, last_row: Sequence[Any]
+) -> Tuple[str, List[Any]]:
+    """Renders the WHERE condition matching the rows that come after last_row when
+    ordering by sort_by and then id, both in the same direction.
+
+    SQLite sorts NULLs first in ascending and last in descending order, which the
+    condition mirrors for nullable sort columns.
+    """
+    op = "<" if descending else ">"
+    last_id = last_row[0]
+    if sort_by == "id":
+        return f"id {op} ?", [last_id]
+    value = last_row[_COLUMN_POSITIONS[sort_by]]
+    if value is None:
+        condition = f"({sort_by} IS NULL AND id {op} ?)"
+        if not descending:
+            condition += f" OR {sort_by} IS NOT NULL"
+        return f"({condition})", [last_id]
+    condition = f"{sort_by} {op} ? OR ({sort_by} = ? AND id {op} ?)"
+    if descending:
+        condition += f" OR {sort_by} IS NULL"
+    return f"({condition})", [value, value, last_id]
+
+
+@functools.lru_cache(maxsize=64)
+def _update_sql(columns: Tuple[str, ...], returning: bool = False) -> str:
+    """Renders the UPDATE statement for a subset of _UPDATABLE_COLUMNS, optionally
+    returning the updated row.
+    """
+    sql = _SQL_UPDATE_TMPL.format(
+        assignments=", ".join(f"{column} = ?" for column in columns)
+    )
+    return f"{sql} RETURNING {_DOCUMENT_COLUMNS}" if returning else sql
+
+
+def _update_params(
+    columns: Tuple[str, ...], updates: Dict[str, Any], document_id: str
+) -> List[Any]:
+    """Builds the parameters of _update_sql(columns) for one document."""
+    params: List[Any] = []
+    for column in columns:
+        value = updates[column]
+        if column == "document_type" and isinstance(value, DocumentType):
+            params.append(value.value)
+        else:
+            params.append(value)
+    params.append(document_id)
+    return params
+
+
+@functools.lru_cache(maxsize=16)
+def _get_many_sql(id_count: int) -> str:
+    """Renders the SELECT statement for a batch lookup of id_count ids."""
+    return _SQL_GET_MANY_TMPL.format(placeholders=", ".join("?" * id_count))
+
 
 def get_db_path() -> str:
     if DATABASE_URL.startswith("sqlite:///./"):
@@ -45,35 +199,273 @@ def get_db_path() -> str:
         return DATABASE_URL
 
 
-async def get_db_connection(db_path: Optional[str] = None) -> aiosqlite.Connection:
-    actual_db_path: str = db_path or get_db_path()
+# Connections handed out by get_db_connection, one per event loop and database path.
+_shared_connections: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, Dict[str, aiosqlite.Connection]
+] = weakref.WeakKeyDictionary()
+_shared_connection_locks: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, asyncio.Lock
+] = weakref.WeakKeyDictionary()
+
+
+def _is_uri(db_path: str) -> bool:
+    """Returns whether db_path is an SQLite URI filename (file:...)."""
+    return db_path.startswith("file:")
+
+
+def _is_in_memory(db_path: str) -> bool:
+    """Returns whether db_path names an in-memory database, which has no file
+    other connections could open read-only."""
+    if db_path == ":memory:":
+        return True
+    if not _is_uri(db_path):
+        return False
+    path, _, query = db_path.removeprefix("file:").partition("?")
+    return path == ":memory:" or ("mode", "memory") in parse_qsl(query)
+
+
+def _read_only_uri(db_path: str, immutable: bool) -> str:
+    """Returns the URI opening the database at db_path, a path or URI, read-only."""
+    if _is_uri(db_path):
+        base, _, query = db_path.partition("?")
+        params = [
+            (key, value)
+            for key, value in parse_qsl(query)
+            if key not in ("mode", "immutable")
+        ]
+    else:
+        base, params = f"file:{pathname2url(os.path.abspath(db_path))}", []
+    params.append(("mode", "ro"))
+    if immutable:
+        params.append(("immutable", "1"))
+    return f"{base}?{urlencode(params)}"
 
-    # Ensure the directory for the database exists
-    db_dir: str = os.path.dirname(actual_db_path)
+
+async def _open_connection(db_path: str) -> aiosqlite.Connection:
+    """Opens a tuned connection to db_path, creating its directory if needed.
+
+    db_path may also be an SQLite URI filename such as
+    "file:name?mode=memory&cache=shared".
+    """
+    is_uri: bool = _is_uri(db_path)
+    db_dir: str = "" if is_uri else os.path.dirname(db_path)
     if db_dir and not os.path.exists(db_dir):
         os.makedirs(db_dir, exist_ok=True)
 
-    conn: aiosqlite.Connection = await aiosqlite.connect(actual_db_path)
+    conn: aiosqlite.Connection = await aiosqlite.connect(
+        db_path, uri=is_uri, cached_statements=STATEMENT_CACHE_SIZE
+    )
+    conn.row_factory = aiosqlite.Row
+    await apply_connection_pragmas(conn)
+    return conn
+
+
+async def _open_read_only_connection(
+    db_path: str, immutable: bool = False
+) -> aiosqlite.Connection:
+    """Opens a tuned, read-only connection to an existing database at db_path.
+
+    With immutable set, SQLite assumes nothing changes the file while it is open
+    and skips all locking and change detection.
+    """
+    conn: aiosqlite.Connection = await aiosqlite.connect(
+        _read_only_uri(db_path, immutable),
+        uri=True,
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
     conn.row_factory = aiosqlite.Row
+    for pragma in _READ_ONLY_PRAGMAS:
+        await conn.execute(pragma)
     return conn
 
 
+class SQLiteReadPool:
+    """A fixed-size pool of read-only connections to one database.
+
+    aiosqlite runs every call of a connection on that connection's own thread,
+    so a single connection serializes all queries. Under WAL, readers on
+    separate connections run concurrently with each other and with the writer.
+
+    An immutable pool is for database files nothing writes to any more, such as
+    the snapshots from SQLiteMetadataStore.create_snapshot().
+    """
+
+    def __init__(
+        self, db_path: str, size: int = READ_POOL_SIZE, immutable: bool = False
+    ) -> None:
+        self.db_path: str = db_path
+        self.size: int = size
+        self.immutable: bool = immutable
+        self._connections: List[aiosqlite.Connection] = []
+        self._idle: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+
+    async def open(self) -> None:
+        """Opens the pool's connections. The database must already exist."""
+        for _ in range(self.size):
+            conn = await _open_read_only_connection(self.db_path, self.immutable)
+            self._connections.append(conn)
+            self._idle.put_nowait(conn)
+
+    @contextlib.asynccontextmanager
+    async def acquire(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Lends out an idle connection, waiting for one if all are in use."""
+        conn = await self._idle.get()
+        try:
+            yield conn
+        finally:
+            # A transaction left open (e.g. by a rejected write) would pin the
+            # connection to an old snapshot of the database.
+            if conn.in_transaction:
+                await conn.rollback()
+            self._idle.put_nowait(conn)
+
+    async def close(self) -> None:
+        """Closes every connection of the pool."""
+        connections, self._connections = self._connections, []
+        self._idle = asyncio.Queue()
+        for conn in connections:
+            await conn.close()
+
+
+async def get_db_connection(db_path: Optional[str] = None) -> aiosqlite.Connection:
+    """Returns the shared connection to the metadata database.
+
+    The first call on an event loop opens the connection; later calls on the same
+    loop and path reuse it. Callers must not close it themselves; use
+    close_db_connections() on shutdown instead.
+    """
+    actual_db_path: str = db_path or get_db_path()
+    loop = asyncio.get_running_loop()
+    lock = _shared_connection_locks.setdefault(loop, asyncio.Lock())
+    async with lock:
+        connections = _shared_connections.setdefault(loop, {})
+        conn = connections.get(actual_db_path)
+        if conn is None:
+            conn = await _open_connection(actual_db_path)
+            connections[actual_db_path] = conn
+    return conn
+
+
+async def close_db_connections() -> None:
+    """Closes the shared connections get_db_connection opened on this event loop."""
+    connections = _shared_connections.pop(asyncio.get_running_loop(), {})
+    for conn in connections.values():
+        await conn.close()
+
+
+async def apply_connection_pragmas(conn: aiosqlite.Connection) -> None:
+    """Applies CONNECTION_PRAGMAS to a freshly opened connection."""
+    for pragma in CONNECTION_PRAGMAS:
+        await conn.execute(pragma)
+
+
+# WITHOUT ROWID stores each row directly in the primary-key B-tree instead of in a
+# rowid table plus a separate index on id; STRICT enforces the declared types.
+_DOCUMENTS_TABLE_DDL = """
+CREATE TABLE IF NOT EXISTS {table} (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    author TEXT,
+    publication_date TEXT,
+    document_type TEXT NOT NULL,
+    date_added INTEGER NOT NULL,
+    file_path TEXT
+) WITHOUT ROWID, STRICT;
+"""
+
+_DOCUMENTS_INDEXES_DDL = """
+-- Filter/sort columns of list_documents_metadata. The composite index also
+-- serves plain document_type filters through its leading column.
+CREATE INDEX IF NOT EXISTS idx_documents_author ON documents(author);
+CREATE INDEX IF NOT EXISTS idx_documents_date_added ON documents(date_added DESC);
+CREATE INDEX IF NOT EXISTS idx_documents_type_date_added
+    ON documents(document_type, date_added DESC);
+"""
+
+
+# Recorded in PRAGMA user_version once create_metadata_tables has brought a database
+# up to date. Bump it whenever the DDL or migrations below change.
+SCHEMA_VERSION: int = 1
+
+
 async def create_metadata_tables(conn: aiosqlite.Connection) -> None:
-    """Creates metadata tables on the given database connection if they don't exist."""
-    await conn.execute("""
-    CREATE TABLE IF NOT EXISTS documents (
-        id TEXT PRIMARY KEY,
-        title TEXT NOT NULL,
-        author TEXT,
-        publication_date TEXT,
-        document_type TEXT NOT NULL,
-        date_added TIMESTAMP NOT NULL,
-        file_path TEXT
-    );
-    """)
+    """Creates metadata tables and their indexes on the given database connection
+    if they don't exist, migrating tables created by older versions of the store.
+
+    Databases already at SCHEMA_VERSION are left untouched, so opening an
+    up-to-date database runs no DDL at all.
+    """
+    async with conn.execute("PRAGMA user_version") as cursor:
+        version_row = await cursor.fetchone()
+    if version_row is not None and version_row[0] >= SCHEMA_VERSION:
+        return
+
+    # Columns of PRAGMA table_list: schema, name, type, ncol, wr, strict.
+    async with conn.execute("PRAGMA table_list('documents')") as cursor:
+        table_info = await cursor.fetchone()
+    if table_info is not None and not (table_info[4] and table_info[5]):
+        await _migrate_legacy_documents_table(conn)
+
+    await conn.executescript(
+        _DOCUMENTS_TABLE_DDL.format(table="documents")
+        + _DOCUMENTS_INDEXES_DDL
+        + "ANALYZE;"
+        + f"PRAGMA user_version = {SCHEMA_VERSION};"
+    )
     await conn.commit()
 
 
+async def _migrate_legacy_documents_table(conn: aiosqlite.Connection) -> None:
+    """Rebuilds a documents table created before the schema became STRICT and
+    WITHOUT ROWID. ALTER TABLE cannot change either property, so the rows are
+    copied into a new table that then replaces the old one.
+    """
+    # The date_added conversion and the rebuild share one transaction, so a
+    # failure leaves the legacy table as it was.
+    await conn.execute("BEGIN")
+    try:
+        # STRICT rejects the ISO-8601 strings older versions stored in date_added.
+        await _migrate_text_date_added(conn)
+        await conn.execute(_DOCUMENTS_TABLE_DDL.format(table="documents_strict"))
+        await conn.execute(
+            """
+            INSERT INTO documents_strict
+                (id, title, author, publication_date, document_type, date_added,
+                 file_path)
+            SELECT id, title, author, publication_date, document_type, date_added,
+                file_path
+            FROM documents
+            """
+        )
+        await conn.execute("DROP TABLE documents")
+        await conn.execute("ALTER TABLE documents_strict RENAME TO documents")
+    except BaseException:
+        await conn.rollback()
+        raise
+    await conn.commit()
+    logger.info("Migrated the documents table to a STRICT, WITHOUT ROWID table")
+
+
+async def _migrate_text_date_added(conn: aiosqlite.Connection) -> None:
+    """Converts ISO-8601 TEXT date_added values written by older versions of the
+    store into epoch microseconds.
+    """
+    async with conn.execute(
+        "SELECT id, date_added FROM documents WHERE typeof(date_added) = 'text'"
+    ) as cursor:
+        rows = list(await cursor.fetchall())
+    if not rows:
+        return
+    await conn.executemany(
+        "UPDATE documents SET date_added = ? WHERE id = ?",
+        [
+            (datetime_to_epoch_us(datetime.fromisoformat(date_added)), doc_id)
+            for doc_id, date_added in rows
+        ],
+    )
+    logger.info(f"Migrated date_added of {len(rows)} document(s) to epoch integers")
+
+
 class SQLiteMetadataStore(MetadataStore):
     """
     Asynchronous SQLite implementation of the MetadataStore protocol using aiosqlite.
@@ -83,7 +475,13 @@ class SQLiteMetadataStore(MetadataStore):
     def __init__(self, database_path: Optional[str] = None) -> None:
         self.db_path: str = database_path or get_db_path()
         self._conn: Optional[aiosqlite.Connection] = None
+        self._read_pool: Optional[SQLiteReadPool] = None
         self._initialized: bool = False
+        # Transactions on the writer connection must not interleave.
+        self._write_lock: asyncio.Lock = asyncio.Lock()
+        # Inserts waiting for the next batch commit, with their callers' futures.
+        self._pending_rows: List[Tuple[Tuple[Any, ...], asyncio.Future[None]]] = []
+        self._flush_task: Optional[asyncio.Task[None]] = None
 
     async def initialize(self) -> None:
         """Initializes the database connection and creates tables if they don't
@@ -92,113 +490,238 @@ class SQLiteMetadataStore(MetadataStore):
         if self._initialized:
             return
 
-        db_dir: str = os.path.dirname(self.db_path)
-        if db_dir and not os.path.exists(db_dir):
-            os.makedirs(db_dir, exist_ok=True)
-
-        self._conn = await aiosqlite.connect(self.db_path)
-        self._conn.row_factory = aiosqlite.Row
+        self._conn = await _open_connection(self.db_path)
         await create_metadata_tables(self._conn)
+        # An in-memory database has no file to open read-only, so reads stay on
+        # the writer connection.
+        if not _is_in_memory(self.db_path):
+            self._read_pool = SQLiteReadPool(self.db_path)
+            await self._read_pool.open()
         self._initialized = True
         logger.info(f"SQLiteMetadataStore initialized for {self.db_path}")
 
     async def close(self) -> None:
         """Closes the database connection."""
+        await self.flush()
+        if self._read_pool:
+            await self._read_pool.close()
+            self._read_pool = None
         if self._conn:
+            # Let SQLite refresh planner statistics gathered during this session.
+            await self._conn.execute("PRAGMA optimize")
             await self._conn.close()
             self._conn = None
             self._initialized = False  # Mark as uninitialized after closing
             logger.info(f"SQLiteMetadataStore connection closed for {self.db_path}")
 
-    async def _ensure_initialized(self) -> None:
-        """Ensures the database is initialized before performing an operation."""
-        if not self._initialized or self._conn is None:
+    def _conn_or_raise(self) -> aiosqlite.Connection:
+        """Returns the writer connection, ensuring the database is initialized."""
+        conn = self._conn
+        if conn is None or not self._initialized:
             raise RuntimeError(
                 "Database not initialized or connection is closed. "
                 "Call await store.initialize() first or ensure it has not been closed."
             )
+        return conn
 
-    def _row_to_document(self, row: aiosqlite.Row) -> Optional[Document]:
-        if not row:
-            return None
-        try:
-            date_added_val: Any = row["date_added"]
-            date_added_dt: datetime
-            if isinstance(date_added_val, str):
-                date_added_dt = datetime.fromisoformat(date_added_val)
-            elif isinstance(date_added_val, (int, float)):
-                date_added_dt = datetime.fromtimestamp(date_added_val)
-            elif isinstance(date_added_val, datetime):
-                date_added_dt = date_added_val
-            else:
-                logger.error(
-                    f"Unexpected type for date_added: {type(date_added_val)}. "
-                    f"Value: {date_added_val}"
-                )
-                try:
-                    date_added_dt = datetime.fromisoformat(str(date_added_val))
-                except ValueError:
-                    logger.error(
-                        f"Could not parse date_added: {date_added_val} "
-                        f"for document id {row['id']}"
-                    )
-                    return None
-
-            return Document(
-                id=row["id"],
-                title=row["title"],
-                author=row["author"],
-                publication_date=row["publication_date"],
-                document_type=DocumentType(row["document_type"]),
-                date_added=date_added_dt,
-                file_path=row["file_path"],
-                metadata={},
-                source=None,
-            )
-        except Exception as e:
-            logger.error(
-                f"Error converting row to Document: {e}. Row data: {dict(row)}"
-            )
-            return None
+    @contextlib.asynccontextmanager
+    async def _reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Lends out a connection for a read, from the read pool when there is one."""
+        conn = self._conn_or_raise()
+        if self._read_pool is None:
+            yield conn
+        else:
+            async with self._read_pool.acquire() as reader:
+                yield reader
 
     # --- Interface methods ---
     # Note: These are synchronous implementations of an async interface.
 
     async def add_document_metadata(self, document: Document) -> None:
-        await self._ensure_initialized()
-        assert self._conn is not None  # For type checker, after _ensure_initialized
+        """Adds metadata for a document.
+
+        A lone call is committed right away. Calls made while an earlier commit is
+        in flight are grouped into one executemany() and commit (see
+        WRITE_BATCH_MAX_ROWS). The call returns once its row is committed and
+        raises the same errors as an individual insert would.
+        """
+        self._conn_or_raise()
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._pending_rows.append((document_to_row(document), future))
+        if self._flush_task is None:
+            self._flush_task = asyncio.ensure_future(self._flush_pending())
+        await future
+
+    async def _flush_pending(self) -> None:
+        """Commits pending inserts, batch by batch, until none are left."""
         try:
-            await self._conn.execute(
-                """ 
-                INSERT INTO documents (id, title, author, publication_date, document_type, date_added, file_path)
-                VALUES (?, ?, ?, ?, ?, ?, ?) 
-            """,  # noqa: E501
-                (
-                    document.id,
-                    document.title,
-                    document.author,
-                    document.publication_date,
-                    document.document_type.value,
-                    document.date_added.isoformat(),
-                    document.file_path,
-                ),
-            )
-            await self._conn.commit()
-        except aiosqlite.IntegrityError as e:
-            logger.error(f"Error adding document metadata for {document.id}: {e}")
+            while self._pending_rows:
+                await self._commit_batch()
+        finally:
+            self._flush_task = None
+
+    async def flush(self) -> None:
+        """Waits until the inserts add_document_metadata has queued are committed."""
+        if self._flush_task is not None:
+            await asyncio.wait({self._flush_task})
+        while self._pending_rows:
+            await self._commit_batch()
+
+    async def _commit_batch(self) -> None:
+        """Inserts and commits up to WRITE_BATCH_MAX_ROWS pending rows."""
+        async with self._write_lock:
+            # Taken under the lock, so rows queued while waiting for it join in
+            batch = self._pending_rows[:WRITE_BATCH_MAX_ROWS]
+            del self._pending_rows[:WRITE_BATCH_MAX_ROWS]
+            if not batch:
+                return
+            try:
+                await self._insert_batch(batch)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            finally:
+                # Whatever went wrong, no caller may be left waiting on its row
+                for _, future in batch:
+                    if not future.done():
+                        future.cancel()
+
+    async def _insert_batch(
+        self, batch: List[Tuple[Tuple[Any, ...], asyncio.Future[None]]]
+    ) -> None:
+        """Inserts and commits batch, resolving the futures of the rows it stored."""
+        conn = self._conn_or_raise()
+        try:
+            await conn.executemany(_SQL_INSERT, [row for row, _ in batch])
+            await conn.commit()
+        except aiosqlite.IntegrityError:
+            await conn.rollback()
+        except BaseException:
+            # The callers are told the batch failed, so none of it may be
+            # committed by a later write.
+            await conn.rollback()
             raise
+        else:
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+            return
+        # Retry row by row, so only the callers whose rows fail see errors.
+        for row, future in batch:
+            await self._insert_one(conn, row, future)
+
+    async def _insert_one(
+        self,
+        conn: aiosqlite.Connection,
+        row: Tuple[Any, ...],
+        future: asyncio.Future[None],
+    ) -> None:
+        """Inserts and commits a single row, reporting the outcome to future."""
+        try:
+            await conn.execute(_SQL_INSERT, row)
+            await conn.commit()
+        except aiosqlite.Error as e:
+            await conn.rollback()
+            logger.error(f"Error adding metadata for document {row[0]}: {e}")
+            if not future.done():
+                future.set_exception(e)
+        except BaseException:
+            await conn.rollback()
+            raise
+        else:
+            if not future.done():
+                future.set_result(None)
+
+    async def create_snapshot(
+        self, snapshot_path: str, size: int = READ_POOL_SIZE
+    ) -> SQLiteReadPool:
+        """Copies the database to snapshot_path and opens a read pool on the copy.
+
+        The copy never changes, so the pool is immutable. It suits long read-only
+        jobs, such as exports or index builds, that want a fixed view of the data.
+
+        Args:
+            snapshot_path: Where to write the copy; an existing file is replaced.
+            size: Number of connections of the returned pool.
+
+        Returns:
+            An open SQLiteReadPool on the copy. The caller is responsible for
+            closing it.
+        """
+        conn = self._conn_or_raise()
+        await self.flush()
+        async with self._write_lock, aiosqlite.connect(snapshot_path) as target:
+            await conn.backup(target)
+            # Immutable readers ignore -wal files, so the copy must not use WAL.
+            await target.execute("PRAGMA journal_mode=DELETE")
+        pool = SQLiteReadPool(snapshot_path, size, immutable=True)
+        await pool.open()
+        return pool
+
+    async def add_documents_metadata(self, documents: Sequence[Document]) -> None:
+        """Adds metadata for several documents with a single commit.
+
+        The batch is atomic: if any insert fails (e.g. a duplicate id or a value
+        SQLite cannot bind) or the call is cancelled, the whole batch is rolled
+        back and the error is re-raised.
+        """
+        conn = self._conn_or_raise()
+        if not documents:
+            return
+        async with self._write_lock:
+            try:
+                await conn.executemany(
+                    _SQL_INSERT, [document_to_row(document) for document in documents]
+                )
+                await conn.commit()
+            except aiosqlite.Error as e:
+                await conn.rollback()
+                logger.error(
+                    f"Error adding metadata for {len(documents)} document(s) "
+                    f"(first id: {documents[0].id}): {e}"
+                )
+                raise
+            except BaseException:
+                # E.g. cancelled mid-batch: the next commit must not pick up the
+                # rows inserted so far.
+                await conn.rollback()
+                raise
 
     async def get_document_metadata(self, document_id: str) -> Optional[Document]:
-        await self._ensure_initialized()
-        assert self._conn is not None
-        async with self._conn.execute(
-            "SELECT * FROM documents WHERE id = ?", (document_id,)
-        ) as cursor:
-            row = await cursor.fetchone()
+        async with self._reader() as conn:
+            async with conn.execute(_SQL_GET_ONE, (document_id,)) as cursor:
+                row = await cursor.fetchone()
         if row:
-            return self._row_to_document(row)
+            return row_to_document(row)
         return None
 
+    async def get_documents_metadata_batch(
+        self, document_ids: Sequence[str]
+    ) -> Dict[str, Document]:
+        """Retrieves metadata for several documents in as few queries as possible.
+
+        Args:
+            document_ids: The unique identifiers of the documents to fetch.
+
+        Returns:
+            A dictionary mapping each found document id to its Document. Ids that
+            are not in the store are absent from the result.
+        """
+        unique_ids: List[str] = list(dict.fromkeys(document_ids))
+        documents: Dict[str, Document] = {}
+        async with self._reader() as conn:
+            for start in range(0, len(unique_ids), MAX_IDS_PER_QUERY):
+                batch_ids = unique_ids[start : start + MAX_IDS_PER_QUERY]
+                async with conn.execute(
+                    _get_many_sql(len(batch_ids)), batch_ids
+                ) as cursor:
+                    rows = await cursor.fetchall()
+                for row in rows:
+                    if (doc := row_to_document(row)) is not None:
+                        documents[doc.id] = doc
+        return documents
+
     async def list_documents_metadata(
         self,
         filters: Optional[Dict[str, Any]] = None,
@@ -207,115 +730,164 @@ class SQLiteMetadataStore(MetadataStore):
         sort_by: Optional[str] = None,
         sort_order: str = "desc",
     ) -> List[Document]:
-        await self._ensure_initialized()
-        assert self._conn is not None
+        return [
+            doc
+            async for doc in self.iter_documents_metadata(
+                filters, offset, limit, sort_by, sort_order
+            )
+        ]
 
-        query: str = "SELECT * FROM documents"
-        params: List[Any] = []
+    async def iter_documents_metadata(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        offset: int = 0,
+        limit: int = 100,
+        sort_by: Optional[str] = None,
+        sort_order: str = "desc",
+    ) -> AsyncIterator[Document]:
+        """Streams document metadata with the same filtering, pagination and
+        sorting as list_documents_metadata.
 
+        Rows are read ITER_CHUNK_SIZE at a time, so large pages are never held in
+        memory all at once. Each chunk is a separate query that resumes after the
+        last row of the previous one (keyset pagination), and the read connection
+        goes back to the pool between chunks, so consumers can do their own reads
+        while iterating. Ties in the sort column are ordered by id.
+        """
+        conditions: List[str] = []
+        params: List[Any] = []
         if filters:
-            conditions: List[str] = []
             for key, value in filters.items():
-                if value is not None:
-                    if key == "document_type" and isinstance(value, DocumentType):
-                        conditions.append(f"{key} = ?")
-                        params.append(value.value)
-                    elif key in [
-                        "id",
-                        "title",
-                        "author",
-                        "publication_date",
-                        "file_path",
-                    ]:
-                        conditions.append(f"{key} = ?")
-                        params.append(value)
-            if conditions:
-                query += " WHERE " + " AND ".join(conditions)
-
-        if sort_by in [
-            "id",
-            "title",
-            "author",
-            "publication_date",
-            "document_type",
-            "date_added",
-        ]:
-            order: str = "DESC" if sort_order.lower() == "desc" else "ASC"
-            query += f" ORDER BY {sort_by} {order}"
-
-        query += " LIMIT ? OFFSET ?"
-        params.extend([limit, offset])
-
-        async with self._conn.execute(query, tuple(params)) as cursor:
-            rows = await cursor.fetchall()
+                handler = FILTER_HANDLERS.get(key)
+                if handler is not None and value is not None:
+                    conditions.append(f"{key} = ?")
+                    params.append(handler(value))
 
-        return [
-            doc
-            for row_data in rows
-            if (doc := self._row_to_document(row_data)) is not None
-        ]
+        if sort_by in _SORT_COLUMNS:
+            assert sort_by is not None
+            key_column = sort_by
+            descending = sort_order.lower() == "desc"
+        else:
+            key_column, descending = "id", False
+        order = "DESC" if descending else "ASC"
+        order_by = f" ORDER BY {key_column} {order}"
+        if key_column != "id":
+            order_by += f", id {order}"
+
+        # A negative limit means no limit, as in SQLite.
+        remaining: Optional[int] = limit if limit >= 0 else None
+        last_row: Optional[Sequence[Any]] = None
+        while remaining is None or remaining > 0:
+            chunk_size = (
+                ITER_CHUNK_SIZE
+                if remaining is None
+                else min(ITER_CHUNK_SIZE, remaining)
+            )
+            chunk_conditions, chunk_params = list(conditions), list(params)
+            if last_row is not None:
+                condition, condition_params = _after_row_condition(
+                    key_column, descending, last_row
+                )
+                chunk_conditions.append(condition)
+                chunk_params.extend(condition_params)
+            query = _SQL_SELECT
+            if chunk_conditions:
+                query += " WHERE " + " AND ".join(chunk_conditions)
+            query += order_by + " LIMIT ? OFFSET ?"
+            chunk_params.extend([chunk_size, offset if last_row is None else 0])
+
+            async with self._reader() as conn:
+                async with conn.execute(query, chunk_params) as cursor:
+                    rows = list(await cursor.fetchall())
+            for row in rows:
+                if (doc := row_to_document(row)) is not None:
+                    yield doc
+            if len(rows) < chunk_size:
+                return
+            last_row = rows[-1]
+            if remaining is not None:
+                remaining -= len(rows)
 
     async def update_document_metadata(
         self, document_id: str, updates: Dict[str, Any]
     ) -> Optional[Document]:
-        await self._ensure_initialized()
-        assert self._conn is not None
-
-        fields_to_update: List[str] = []
-        update_params: List[Any] = []
-        allowed_fields: List[str] = [
-            "title",
-            "author",
-            "publication_date",
-            "document_type",
-            "file_path",
-        ]
-
-        for key, value in updates.items():
-            if key in allowed_fields:
-                fields_to_update.append(f"{key} = ?")
-                if key == "document_type" and isinstance(value, DocumentType):
-                    update_params.append(value.value)
-                else:
-                    update_params.append(value)
+        conn = self._conn_or_raise()
 
-        if not fields_to_update:
+        columns = _update_columns(updates)
+        if not columns:
             return await self.get_document_metadata(document_id)
 
-        query = f"UPDATE documents SET {', '.join(fields_to_update)} WHERE id = ?"
-        update_params.append(document_id)
+        # RETURNING hands back the updated row, so no follow-up SELECT is needed.
+        query = _update_sql(columns, returning=True)
+        update_params = _update_params(columns, updates, document_id)
 
-        try:
-            cursor = await self._conn.execute(query, tuple(update_params))
-            await self._conn.commit()
-            if cursor.rowcount == 0:
-                await (
-                    cursor.close()
-                )  # Close cursor if no rows updated before returning None
+        async with self._write_lock:
+            try:
+                async with conn.execute(query, tuple(update_params)) as cursor:
+                    row = await cursor.fetchone()
+                await conn.commit()
+            except aiosqlite.Error as e:
+                await conn.rollback()
+                logger.error(f"Error updating document metadata for {document_id}: {e}")
                 return None
-            await cursor.close()  # Ensure cursor is closed after successful update
-        except aiosqlite.Error as e:
-            logger.error(f"Error updating document metadata for {document_id}: {e}")
-            # Assuming rollback is handled by aiosqlite if commit fails,
-            # or manage explicitly if needed
+
+        if row is None:
             return None
+        return row_to_document(row)
+
+    async def update_documents_metadata(
+        self, updates: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Document]:
+        """Updates several documents in a single transaction.
+
+        Updates that change the same set of columns share one UPDATE statement
+        and are applied together with executemany().
 
-        return await self.get_document_metadata(document_id)
+        Args:
+            updates: A dictionary mapping document ids to their field updates, in
+                     the same form update_document_metadata accepts.
+
+        Returns:
+            A dictionary mapping each found document id to its updated Document.
+            Unknown ids are absent. If the database rejects any update, the whole
+            batch is rolled back and an empty dictionary is returned.
+        """
+        conn = self._conn_or_raise()
+
+        grouped_params: Dict[Tuple[str, ...], List[List[Any]]] = {}
+        for document_id, document_updates in updates.items():
+            columns = _update_columns(document_updates)
+            if columns:
+                grouped_params.setdefault(columns, []).append(
+                    _update_params(columns, document_updates, document_id)
+                )
+
+        async with self._write_lock:
+            try:
+                for columns, params in grouped_params.items():
+                    await conn.executemany(_update_sql(columns), params)
+                await conn.commit()
+            except aiosqlite.Error as e:
+                await conn.rollback()
+                logger.error(
+                    f"Error updating metadata of {len(updates)} document(s): {e}"
+                )
+                return {}
+
+        return await self.get_documents_metadata_batch(list(updates))
 
     async def delete_document_metadata(self, document_id: str) -> bool:
-        await self._ensure_initialized()
-        assert self._conn is not None
-        try:
-            cursor = await self._conn.execute(
-                "DELETE FROM documents WHERE id = ?", (document_id,)
-            )
-            await self._conn.commit()
-            rowcount = cursor.rowcount
-            await cursor.close()
-            return bool(rowcount > 0)  # Explicitly cast to bool
-        except aiosqlite.Error as e:
-            logger.error(f"Error deleting document metadata for {document_id}: {e}")
-            return False
+        conn = self._conn_or_raise()
+        async with self._write_lock:
+            try:
+                cursor = await conn.execute(_SQL_DELETE, (document_id,))
+                await conn.commit()
+                rowcount = cursor.rowcount
+                await cursor.close()
+                return bool(rowcount > 0)  # Explicitly cast to bool
+            except aiosqlite.Error as e:
+                logger.error(f"Error deleting document metadata for {document_id}: {e}")
+                return False
 
 
 # Example Usage (for testing or direct script execution)
@@ -347,7 +919,7 @@ async def main_example() -> None:
             author="Author One",
             publication_date="2023-01-15",
             document_type=DocumentType.TXT,  # Using DocumentType enum
-            date_added=datetime.utcnow(),  # Using datetime object
+            date_added=datetime.now(timezone.utc),  # Using datetime object
             file_path="/path/to/alpha.txt",
             metadata={
                 "custom_key": "custom_value"
@@ -362,7 +934,7 @@ async def main_example() -> None:
             author="Author Two",
             publication_date="2024",
             document_type=DocumentType.PDF,
-            date_added=datetime.utcnow(),
+            date_added=datetime.now(timezone.utc),
             file_path="/path/to/beta.pdf",
             source=None,  # Explicitly provide source=None
         )
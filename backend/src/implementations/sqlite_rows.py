@@ -0,0 +1,80 @@
+"""Conversions between documents and rows of the SQLite metadata store.
+
+These run once per row or filter, so they are kept free of async code and fully
+annotated, allowing this module to be compiled with mypyc (see pyproject.toml).
+"""
+
+import logging
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import aiosqlite
+
+from ..models import Document, DocumentType, epoch_us_to_datetime
+
+logger = logging.getLogger(__name__)
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _document_type_param(value: Any) -> Any:
+    return value.value if isinstance(value, DocumentType) else value
+
+
+# Columns list_documents_metadata accepts as equality filters, each mapped to the
+# function turning a filter value into its query parameter.
+FILTER_HANDLERS: Dict[str, Callable[[Any], Any]] = {
+    "id": _identity,
+    "title": _identity,
+    "author": _identity,
+    "publication_date": _identity,
+    "document_type": _document_type_param,
+    "file_path": _identity,
+}
+
+
+def row_to_document(row: aiosqlite.Row) -> Optional[Document]:
+    """Builds a Document from a row of the store's fixed document column order."""
+    if not row:
+        return None
+    try:
+        (
+            document_id,
+            title,
+            author,
+            publication_date,
+            document_type,
+            date_added,
+            file_path,
+        ) = row
+        # The STRICT table enforces each column's type and from_value() rejects
+        # unknown document types, so model_construct() can skip pydantic's
+        # validation.
+        return Document.model_construct(
+            id=document_id,
+            title=title,
+            author=author,
+            publication_date=publication_date,
+            document_type=DocumentType.from_value(document_type),
+            date_added=epoch_us_to_datetime(date_added),
+            file_path=file_path,
+            metadata={},
+            source=None,
+        )
+    except Exception as e:
+        logger.error(f"Error converting row to Document: {e}. Row data: {dict(row)}")
+        return None
+
+
+def document_to_row(document: Document) -> Tuple[Any, ...]:
+    """Returns the insert parameters of document, in the store's column order."""
+    return (
+        document.id,
+        document.title,
+        document.author,
+        document.publication_date,
+        document.document_type.value,
+        document.date_added_us,
+        document.file_path,
+    )
@@ -1,4 +1,14 @@
-from typing import Any, Dict, List, Optional, Protocol
+from typing import (
+    AbstractSet,
+    Any,
+    Collection,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Union,
+)
 
 from .models import (  # Added DocumentType
     Document,
@@ -8,6 +18,44 @@ from .models import (  # Added DocumentType
 )
 
 
+def document_id_filter(
+    document_ids: Optional[Collection[str]],
+) -> Optional[AbstractSet[str]]:
+    """Turns the document_ids argument of a search into a set for membership tests.
+
+    Args:
+        document_ids: The document IDs passed to a search, or None.
+
+    Returns:
+        The IDs as a set (the argument itself if it already is one), or None when
+        no filter was given.
+    """
+    if document_ids is None:
+        return None
+    if isinstance(document_ids, AbstractSet):
+        return document_ids
+    return frozenset(document_ids)
+
+
+def validate_query(
+    query_text: Optional[str], query_embedding: Optional[Sequence[float]]
+) -> None:
+    """Checks the query arguments of VectorStore.search_similar_chunks.
+
+    Implementations call this first thing, so invalid calls fail before any work
+    is done. Empty texts and embeddings count as not provided.
+
+    Raises:
+        ValueError: If neither or both of query_text and query_embedding are
+        provided.
+    """
+    has_text = bool(query_text)
+    # len() rather than truthiness, which array types may not support
+    has_embedding = query_embedding is not None and len(query_embedding) > 0
+    if has_text == has_embedding:
+        raise ValueError("Provide exactly one of query_text or query_embedding.")
+
+
 class DocumentStore(Protocol):
     """Interface for physical document storage operations.
 
@@ -72,6 +120,17 @@ class MetadataStore(Protocol):
         """
         ...
 
+    async def add_documents_metadata(self, documents: Sequence[Document]) -> None:
+        """Adds metadata for several new documents in one operation.
+
+        Implementations should write the whole batch at once (e.g. a single
+        executemany() and commit) rather than once per document.
+
+        Args:
+            documents: The Document objects containing the metadata to be saved.
+        """
+        ...
+
     async def get_document_metadata(self, document_id: str) -> Optional[Document]:
         """Retrieves metadata for a specific document by its unique ID.
 
@@ -151,7 +210,13 @@ class VectorStore(Protocol):
         """Adds text chunks to the vector store.
 
         If the TextChunk objects do not contain pre-computed embeddings, the
-        implementing class is responsible for generating them before storage.
+        implementing class is responsible for generating them before storage. It
+        must request embeddings in batches of chunks, up to the provider's maximum
+        batch size, rather than once per chunk; independent batches may be
+        requested concurrently.
+        Embeddings may be stored at reduced precision (e.g. float32 instead of
+        Python floats, float16 or int8-quantized), as long as similarity scores
+        stay comparable.
 
         Args:
             chunks: A list of TextChunk objects to be added.
@@ -165,9 +230,9 @@ class VectorStore(Protocol):
     async def search_similar_chunks(
         self,
         query_text: Optional[str] = None,
-        query_embedding: Optional[List[float]] = None,
+        query_embedding: Optional[Sequence[float]] = None,
         top_k: int = 5,
-        document_ids: Optional[List[str]] = None,
+        document_ids: Optional[Collection[str]] = None,
         metadata_filter: Optional[Dict[str, Any]] = None,
     ) -> List[SearchResult]:
         """Searches for text chunks semantically similar to a given query.
@@ -179,11 +244,14 @@ class VectorStore(Protocol):
             query_text: The raw text of the query. If provided, query_embedding should
                         be None.
             query_embedding: A pre-computed vector embedding for the query. If provided,
-                             query_text should be None.
+                             query_text should be None. Any sequence of floats is
+                             accepted (e.g. an array.array), so decoded embeddings
+                             need not be copied into a list first.
             top_k: The maximum number of similar chunks to return.
-            document_ids: An optional list of document IDs to restrict the search to.
-                          If provided, only chunks from these documents will be
-                          considered.
+            document_ids: An optional collection of document IDs to restrict the
+                          search to. If provided, only chunks from these documents
+                          will be considered. Pass a set for large filters; other
+                          collections are converted to one before the scan.
             metadata_filter: An optional dictionary to filter chunks based on their
                              metadata. The exact filtering capabilities depend on the
                              The exact filtering capabilities depend on the underlying
@@ -194,7 +262,38 @@ class VectorStore(Protocol):
 
         Raises:
             ValueError: If neither query_text nor query_embedding is provided, or if
-            both are.
+            both are. Implementations can check this with validate_query().
+        """
+        ...
+
+    async def search_similar_chunks_batch(
+        self,
+        queries: Sequence[Union[str, Sequence[float]]],
+        top_k: int = 5,
+        document_ids: Optional[Collection[str]] = None,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+    ) -> List[List[SearchResult]]:
+        """Runs several similarity searches that share the same filters.
+
+        Equivalent to calling search_similar_chunks once per query, but lets the
+        implementation embed all text queries together, build the filters once and
+        issue a single batched search to the underlying vector database.
+
+        Args:
+            queries: The queries to run, each either raw text or a pre-computed
+                     vector embedding.
+            top_k: The maximum number of similar chunks to return per query.
+            document_ids: An optional collection of document IDs to restrict every
+                          search to.
+            metadata_filter: An optional dictionary to filter chunks based on their
+                             metadata, applied to every search.
+
+        Returns:
+            One list of SearchResult objects per query, in the order of queries,
+            each ordered by similarity score.
+
+        Raises:
+            ValueError: If any query is empty.
         """
         ...
 
@@ -227,6 +326,24 @@ class VectorStore(Protocol):
         """
         ...
 
+    async def get_text_chunks_batch(
+        self, chunk_ids: Sequence[str]
+    ) -> Dict[str, TextChunk]:
+        """Retrieves several text chunks in one call.
+
+        Lets implementations fetch all chunks with a single request to the
+        underlying vector database instead of one get_text_chunk call per ID. Like
+        get_text_chunk, this is optional for stores that don't keep the text.
+
+        Args:
+            chunk_ids: The unique identifiers of the text chunks to fetch.
+
+        Returns:
+            A dictionary mapping each found chunk id to its TextChunk. Ids that are
+            not in the store are absent from the result.
+        """
+        ...
+
     async def update_text_chunk(
         self, chunk_id: str, updates: Dict[str, Any]
     ) -> Optional[TextChunk]:
@@ -1,8 +1,32 @@
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 from typing import Any, Dict, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+# Models are treated as immutable values: nothing assigns to them after
+# construction, so freezing them documents that and rules out accidental edits.
+# Unknown fields are dropped rather than stored.
+_MODEL_CONFIG = ConfigDict(frozen=True, extra="ignore", validate_assignment=False)
+
+# Reference point for the integer microsecond timestamps used by storage backends.
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def datetime_to_epoch_us(value: datetime) -> int:
+    """Converts a datetime to integer microseconds since the Unix epoch.
+
+    Naive datetimes are taken to be UTC.
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // _ONE_MICROSECOND
+
+
+def epoch_us_to_datetime(value: int) -> datetime:
+    """Converts integer microseconds since the Unix epoch to an aware UTC datetime."""
+    return _EPOCH + timedelta(microseconds=value)
 
 
 class DocumentType(str, Enum):
@@ -17,6 +41,26 @@ class DocumentType(str, Enum):
     TXT = "txt"
     MD = "md"
 
+    @classmethod
+    def from_value(cls, value: str) -> "DocumentType":
+        """Returns the member whose value is value.
+
+        Equivalent to DocumentType(value), but a plain dict lookup, which is much
+        cheaper on hot paths such as converting stored rows.
+
+        Raises:
+            ValueError: If value is not a known document type.
+        """
+        try:
+            return _DOCUMENT_TYPE_BY_VALUE[value]
+        except KeyError:
+            return cls(value)  # Raises ValueError for unknown values
+
+
+_DOCUMENT_TYPE_BY_VALUE: Dict[str, DocumentType] = {
+    document_type.value: document_type for document_type in DocumentType
+}
+
 
 class Document(BaseModel):
     """Represents a document processed and stored by the system.
@@ -36,6 +80,8 @@ class Document(BaseModel):
                 'file_upload', 'web_scrape').
     """
 
+    model_config = _MODEL_CONFIG
+
     id: str = Field(..., description="Unique identifier for the document")
     title: str = Field(..., description="Title of the document")
     author: Optional[str] = Field(None, description="Author of the document")
@@ -44,7 +90,7 @@ class Document(BaseModel):
     )
     document_type: DocumentType = Field(..., description="Type of the document")
     date_added: datetime = Field(
-        default_factory=datetime.utcnow,
+        default_factory=lambda: datetime.now(timezone.utc),
         description="Timestamp when the document was added",
     )
     file_path: Optional[str] = Field(
@@ -55,6 +101,11 @@ class Document(BaseModel):
     )
     source: Optional[str] = Field(None, description="Origin of the document")
 
+    @property
+    def date_added_us(self) -> int:
+        """date_added as integer microseconds since the Unix epoch."""
+        return datetime_to_epoch_us(self.date_added)
+
 
 class TextChunk(BaseModel):
     """Represents a segment of text extracted from a document.
@@ -69,6 +120,8 @@ class TextChunk(BaseModel):
                   position within the document).
     """
 
+    model_config = _MODEL_CONFIG
+
     id: str = Field(..., description="Unique identifier for the text chunk")
     document_id: str = Field(..., description="Identifier of the parent document")
     text: str = Field(..., description="The actual text content of the chunk")
@@ -89,6 +142,8 @@ class SearchResult(BaseModel):
         chunk_metadata: Metadata associated with the matched text chunk.
     """
 
+    model_config = _MODEL_CONFIG
+
     chunk_id: str = Field(..., description="ID of the matched text chunk")
     document_id: str = Field(..., description="ID of the document containing the chunk")
     text: str = Field(..., description="Text of the matched chunk")
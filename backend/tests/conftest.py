@@ -0,0 +1,19 @@
+import asyncio
+
+import pytest
+
+try:
+    import uvloop
+except ImportError:  # uvloop is optional; the default loop works as well
+    uvloop = None
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy() -> asyncio.AbstractEventLoopPolicy:
+    """The policy pytest-asyncio creates the session's event loop with.
+
+    A uvloop policy when uvloop is installed, the default policy otherwise.
+    """
+    if uvloop is not None:
+        return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
@@ -1,50 +1,56 @@
 import asyncio
-import os
-import uuid
+import itertools
+import sqlite3
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Any, AsyncGenerator, Dict
 
 import aiosqlite
 import pytest
 
 from backend.src.implementations.sqlite_metadata_store import (
+    READ_POOL_SIZE,
+    SCHEMA_VERSION,
     SQLiteMetadataStore,
+    close_db_connections,
+    get_db_connection,
 )
 from backend.src.models import Document, DocumentType
 
-
-@pytest.fixture(scope="module")
-def event_loop():
-    """A module-scoped event loop.
-    pytest-asyncio will use this for all tests in the module.
-    """
-    policy = asyncio.get_event_loop_policy()
-    loop = policy.new_event_loop()
-    yield loop
-    loop.close()
+# Unique names for shared in-memory databases within this test run.
+_MEMORY_DB_IDS = itertools.count()
 
 
 @pytest.fixture
-async def temp_db_path() -> AsyncGenerator[str, None]:
-    """Provides a temporary database path that is cleaned up after the test."""
-    db_file = f"./test_metadata_store_async_{uuid.uuid4().hex}.db"
-    yield db_file
-    if os.path.exists(db_file):
-        os.remove(db_file)
+def temp_db_path(tmp_path: Path) -> str:
+    """Provides a database path in a temporary directory pytest cleans up."""
+    return str(tmp_path / "test_metadata_store_async.db")
 
 
-@pytest.fixture
-async def metadata_store(
-    temp_db_path: str,
+@pytest.fixture(scope="module")
+async def shared_metadata_store(
+    tmp_path_factory: pytest.TempPathFactory,
 ) -> AsyncGenerator[SQLiteMetadataStore, None]:
-    """Provides an initialized instance of SQLiteMetadataStore with a temporary
-    database."""
-    store = SQLiteMetadataStore(database_path=temp_db_path)
+    """Provides an initialized SQLiteMetadataStore shared by the tests of this
+    module, so the schema is only created once."""
+    db_dir = tmp_path_factory.mktemp("metadata_store")
+    store = SQLiteMetadataStore(database_path=str(db_dir / "shared.db"))
     await store.initialize()
     yield store
     await store.close()
 
 
+@pytest.fixture
+async def metadata_store(
+    shared_metadata_store: SQLiteMetadataStore,
+) -> SQLiteMetadataStore:
+    """Provides the shared SQLiteMetadataStore, emptied before each test."""
+    conn = shared_metadata_store._conn_or_raise()
+    await conn.execute("DELETE FROM documents")
+    await conn.commit()
+    return shared_metadata_store
+
+
 @pytest.fixture
 def sample_doc1() -> Document:
     return Document(
@@ -68,9 +74,7 @@ def sample_doc2() -> Document:
         author="Author Two",
         publication_date="2024",
         document_type=DocumentType.PDF,
-        date_added=datetime.now(timezone.utc).replace(
-            microsecond=0
-        ),  # Ensure no microseconds for comparison
+        date_added=datetime.now(timezone.utc),
         file_path="/path/to/beta.pdf",
     )
 
@@ -89,20 +93,263 @@ async def test_add_and_get_document(
     assert retrieved_doc.author == sample_doc1.author
     assert retrieved_doc.publication_date == sample_doc1.publication_date
     assert retrieved_doc.document_type == sample_doc1.document_type
-    assert retrieved_doc.date_added.replace(
-        microsecond=0
-    ) == sample_doc1.date_added.replace(microsecond=0)
+    # date_added is stored as integer microseconds, so it round-trips exactly.
+    assert retrieved_doc.date_added == sample_doc1.date_added
     assert retrieved_doc.file_path == sample_doc1.file_path
     assert retrieved_doc.metadata == {}
     assert retrieved_doc.source is None
 
 
+@pytest.mark.asyncio
+async def test_initialize_applies_connection_pragmas(
+    metadata_store: SQLiteMetadataStore,
+):
+    """Test that the store connection is switched to WAL with relaxed syncing."""
+    assert metadata_store._conn is not None
+    async with metadata_store._conn.execute("PRAGMA journal_mode") as cursor:
+        assert (await cursor.fetchone())[0] == "wal"
+    async with metadata_store._conn.execute("PRAGMA synchronous") as cursor:
+        assert (await cursor.fetchone())[0] == 1  # NORMAL
+
+
+@pytest.mark.asyncio
+async def test_reads_use_read_only_pool(
+    metadata_store: SQLiteMetadataStore, sample_doc1: Document, sample_doc2: Document
+):
+    """Test that reads go through read-only connections that see committed writes."""
+    assert metadata_store._read_pool is not None
+    await metadata_store.add_documents_metadata([sample_doc1, sample_doc2])
+
+    results = await asyncio.gather(
+        *(
+            metadata_store.get_document_metadata(doc_id)
+            for doc_id in [sample_doc1.id, sample_doc2.id] * READ_POOL_SIZE
+        )
+    )
+    assert [doc.id for doc in results if doc] == [
+        sample_doc1.id,
+        sample_doc2.id,
+    ] * READ_POOL_SIZE
+
+    async with metadata_store._read_pool.acquire() as conn:
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            await conn.execute("DELETE FROM documents")
+
+
+@pytest.mark.asyncio
+async def test_create_snapshot(
+    metadata_store: SQLiteMetadataStore,
+    temp_db_path: str,
+    sample_doc1: Document,
+    sample_doc2: Document,
+):
+    """Test that a snapshot keeps the data as of its creation."""
+    await metadata_store.add_document_metadata(sample_doc1)
+    snapshot_path = f"{temp_db_path}.snapshot"
+    pool = await metadata_store.create_snapshot(snapshot_path, size=1)
+    try:
+        await metadata_store.add_document_metadata(sample_doc2)
+        async with pool.acquire() as conn:
+            async with conn.execute("SELECT id FROM documents") as cursor:
+                rows = await cursor.fetchall()
+        assert [row[0] for row in rows] == [sample_doc1.id]
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_store_on_shared_memory_uri(sample_doc1: Document):
+    """Test that the store accepts an in-memory, shared-cache URI filename."""
+    db_uri = f"file:testdb_{next(_MEMORY_DB_IDS)}?mode=memory&cache=shared"
+    store = SQLiteMetadataStore(database_path=db_uri)
+    await store.initialize()
+    try:
+        assert store._read_pool is None
+        await store.add_document_metadata(sample_doc1)
+        async with aiosqlite.connect(db_uri, uri=True) as other_conn:
+            async with other_conn.execute("SELECT id FROM documents") as cursor:
+                assert [row[0] for row in await cursor.fetchall()] == [sample_doc1.id]
+    finally:
+        await store.close()
+
+
+@pytest.mark.asyncio
+async def test_get_db_connection_is_shared(temp_db_path: str):
+    """Test that get_db_connection hands out one tuned connection per database."""
+    conn = await get_db_connection(temp_db_path)
+    try:
+        assert await get_db_connection(temp_db_path) is conn
+        async with conn.execute("PRAGMA journal_mode") as cursor:
+            assert (await cursor.fetchone())[0] == "wal"
+    finally:
+        await close_db_connections()
+
+
+@pytest.mark.asyncio
+async def test_initialize_creates_strict_without_rowid_table(
+    metadata_store: SQLiteMetadataStore,
+):
+    """Test that the documents table is created as a STRICT, WITHOUT ROWID table."""
+    assert metadata_store._conn is not None
+    async with metadata_store._conn.execute("PRAGMA table_list('documents')") as cursor:
+        table_info = await cursor.fetchone()
+    assert table_info["wr"] == 1
+    assert table_info["strict"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rows_from_other_writers_are_checked(
+    metadata_store: SQLiteMetadataStore,
+):
+    """Test that rows written outside the store can't yield invalid documents."""
+    conn = metadata_store._conn_or_raise()
+    with pytest.raises(aiosqlite.IntegrityError):
+        await conn.execute(
+            "INSERT INTO documents (id, title, document_type, date_added)"
+            " VALUES ('bad_date', 'Title', 'pdf', 'yesterday')"
+        )
+    await conn.execute(
+        "INSERT INTO documents (id, title, document_type, date_added)"
+        " VALUES ('bad_type', 'Title', 'exe', 0)"
+    )
+    await conn.commit()
+
+    assert await metadata_store.get_document_metadata("bad_type") is None
+
+
+@pytest.mark.asyncio
+async def test_initialize_creates_indexes(metadata_store: SQLiteMetadataStore):
+    """Test that the indexes backing list filters and sorting are created."""
+    assert metadata_store._conn is not None
+    async with metadata_store._conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'documents'"
+    ) as cursor:
+        index_names = {row[0] for row in await cursor.fetchall()}
+    assert {
+        "idx_documents_author",
+        "idx_documents_date_added",
+        "idx_documents_type_date_added",
+    } <= index_names
+
+
+@pytest.mark.asyncio
+async def test_initialize_skips_ddl_for_current_schema(temp_db_path: str):
+    """Test that reopening an up-to-date database does not re-run the DDL."""
+    store = SQLiteMetadataStore(database_path=temp_db_path)
+    await store.initialize()
+    assert store._conn is not None
+    async with store._conn.execute("PRAGMA user_version") as cursor:
+        assert (await cursor.fetchone())[0] == SCHEMA_VERSION
+    await store._conn.execute("DROP INDEX idx_documents_author")
+    await store.close()
+
+    reopened_store = SQLiteMetadataStore(database_path=temp_db_path)
+    await reopened_store.initialize()
+    try:
+        assert reopened_store._conn is not None
+        async with reopened_store._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'idx_documents_author'"
+        ) as cursor:
+            assert await cursor.fetchone() is None
+    finally:
+        await reopened_store.close()
+
+
+@pytest.mark.asyncio
+async def test_initialize_migrates_legacy_table(temp_db_path: str):
+    """Test that tables from older versions become STRICT, WITHOUT ROWID tables
+    and that their ISO-8601 date_added values become integers."""
+    legacy_date = datetime(2024, 5, 17, 8, 30, 15, 123456, tzinfo=timezone.utc)
+    with sqlite3.connect(temp_db_path) as legacy_conn:
+        legacy_conn.execute(
+            "CREATE TABLE documents (id TEXT PRIMARY KEY, title TEXT NOT NULL, "
+            "author TEXT, publication_date TEXT, document_type TEXT NOT NULL, "
+            "date_added TIMESTAMP NOT NULL, file_path TEXT)"
+        )
+        legacy_conn.execute(
+            "INSERT INTO documents (id, title, document_type, date_added) "
+            "VALUES (?, ?, ?, ?)",
+            ("legacy_doc", "Legacy", "txt", legacy_date.isoformat()),
+        )
+    legacy_conn.close()
+
+    store = SQLiteMetadataStore(database_path=temp_db_path)
+    await store.initialize()
+    try:
+        assert store._conn is not None
+        async with store._conn.execute(
+            "SELECT typeof(date_added) FROM documents WHERE id = 'legacy_doc'"
+        ) as cursor:
+            assert (await cursor.fetchone())[0] == "integer"
+        async with store._conn.execute("PRAGMA table_list('documents')") as cursor:
+            table_info = await cursor.fetchone()
+        assert table_info["wr"] == 1
+        assert table_info["strict"] == 1
+        migrated_doc = await store.get_document_metadata("legacy_doc")
+        assert migrated_doc is not None
+        assert migrated_doc.date_added == legacy_date
+    finally:
+        await store.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_legacy_migration_leaves_table_unchanged(temp_db_path: str):
+    """Test that a legacy table whose rows can't be migrated is left as it was."""
+    with sqlite3.connect(temp_db_path) as legacy_conn:
+        legacy_conn.execute(
+            "CREATE TABLE documents (id TEXT PRIMARY KEY, title TEXT NOT NULL, "
+            "author TEXT, publication_date TEXT, document_type TEXT NOT NULL, "
+            "date_added TIMESTAMP NOT NULL, file_path TEXT)"
+        )
+        legacy_conn.executemany(
+            "INSERT INTO documents (id, title, document_type, date_added) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                ("text_date", "Text", "txt", "2024-05-17T08:30:15+00:00"),
+                # STRICT rejects a REAL that is not a whole number
+                ("real_date", "Real", "txt", 1.5),
+            ],
+        )
+    legacy_conn.close()
+
+    store = SQLiteMetadataStore(database_path=temp_db_path)
+    with pytest.raises(aiosqlite.IntegrityError):
+        await store.initialize()
+    await store.close()
+
+    with sqlite3.connect(temp_db_path) as conn:
+        table_info = conn.execute("PRAGMA table_list('documents')").fetchone()
+        date_type = conn.execute(
+            "SELECT typeof(date_added) FROM documents WHERE id = 'text_date'"
+        ).fetchone()
+        user_version = conn.execute("PRAGMA user_version").fetchone()
+    conn.close()
+    assert table_info[5] == 0
+    assert date_type[0] == "text"
+    assert user_version[0] == 0
+
+
 @pytest.mark.asyncio
 async def test_get_non_existent_document(metadata_store: SQLiteMetadataStore):
     """Test retrieving a non-existent document returns None."""
     assert await metadata_store.get_document_metadata("non_existent_id") is None
 
 
+@pytest.mark.asyncio
+async def test_get_documents_metadata_batch(
+    metadata_store: SQLiteMetadataStore, sample_doc1: Document, sample_doc2: Document
+):
+    """Test fetching several documents at once, skipping unknown ids."""
+    await metadata_store.add_documents_metadata([sample_doc1, sample_doc2])
+
+    docs = await metadata_store.get_documents_metadata_batch(
+        [sample_doc1.id, "non_existent_id", sample_doc2.id, sample_doc1.id]
+    )
+    assert set(docs) == {sample_doc1.id, sample_doc2.id}
+    assert docs[sample_doc2.id].title == sample_doc2.title
+    assert await metadata_store.get_documents_metadata_batch([]) == {}
+
+
 @pytest.mark.asyncio
 async def test_add_duplicate_document_id(
     metadata_store: SQLiteMetadataStore, sample_doc1: Document
@@ -113,6 +360,109 @@ async def test_add_duplicate_document_id(
         await metadata_store.add_document_metadata(sample_doc1)
 
 
+@pytest.mark.asyncio
+async def test_concurrent_adds_are_batched(
+    metadata_store: SQLiteMetadataStore, sample_doc1: Document, sample_doc2: Document
+):
+    """Test that concurrent adds commit together and fail only for bad rows."""
+    duplicate = sample_doc1.model_copy(update={"title": "Duplicate"})
+    results = await asyncio.gather(
+        metadata_store.add_document_metadata(sample_doc1),
+        metadata_store.add_document_metadata(duplicate),
+        metadata_store.add_document_metadata(sample_doc2),
+        return_exceptions=True,
+    )
+
+    assert results[0] is None
+    assert isinstance(results[1], aiosqlite.IntegrityError)
+    assert results[2] is None
+    stored = await metadata_store.get_documents_metadata_batch(
+        [sample_doc1.id, sample_doc2.id]
+    )
+    assert stored[sample_doc1.id].title == sample_doc1.title
+    assert sample_doc2.id in stored
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_rolled_back(
+    metadata_store: SQLiteMetadataStore, sample_doc1: Document, sample_doc2: Document
+):
+    """Test that rows of a batch whose callers saw an error are never committed."""
+    unbindable = sample_doc1.model_copy(update={"title": object()})
+    results = await asyncio.gather(
+        metadata_store.add_document_metadata(sample_doc2),
+        metadata_store.add_document_metadata(unbindable),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, aiosqlite.Error) for result in results)
+
+    await metadata_store.add_document_metadata(sample_doc1)
+    assert await metadata_store.get_document_metadata(sample_doc2.id) is None
+
+
+@pytest.mark.asyncio
+async def test_failed_retry_resolves_every_caller(
+    metadata_store: SQLiteMetadataStore,
+    sample_doc1: Document,
+    sample_doc2: Document,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Test that an unexpected error while retrying a batch fails all its callers."""
+    await metadata_store.add_document_metadata(sample_doc1)
+
+    async def failing_insert_one(*args: Any) -> None:
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(SQLiteMetadataStore, "_insert_one", failing_insert_one)
+    results = await asyncio.wait_for(
+        asyncio.gather(
+            metadata_store.add_document_metadata(sample_doc2),
+            metadata_store.add_document_metadata(sample_doc1),
+            return_exceptions=True,
+        ),
+        timeout=10,
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_add_documents_metadata_bulk(
+    metadata_store: SQLiteMetadataStore, sample_doc1: Document, sample_doc2: Document
+):
+    """Test adding several documents in one call."""
+    await metadata_store.add_documents_metadata([sample_doc1, sample_doc2])
+
+    docs = await metadata_store.list_documents_metadata()
+    assert {doc.id for doc in docs} == {sample_doc1.id, sample_doc2.id}
+
+
+@pytest.mark.asyncio
+async def test_add_documents_metadata_bulk_is_atomic(
+    metadata_store: SQLiteMetadataStore, sample_doc1: Document, sample_doc2: Document
+):
+    """Test that a failing bulk insert leaves no partially inserted documents."""
+    await metadata_store.add_document_metadata(sample_doc1)
+    with pytest.raises(aiosqlite.IntegrityError):
+        await metadata_store.add_documents_metadata([sample_doc2, sample_doc1])
+
+    assert await metadata_store.get_document_metadata(sample_doc2.id) is None
+
+
+@pytest.mark.asyncio
+async def test_add_documents_metadata_bulk_rolls_back_on_any_error(
+    metadata_store: SQLiteMetadataStore, sample_doc1: Document, sample_doc2: Document
+):
+    """Test that a bulk insert failing for a reason other than a constraint does
+    not leave its rows to be committed by the next write."""
+    unbindable = sample_doc1.model_copy(update={"title": object()})
+    with pytest.raises(aiosqlite.Error):
+        await metadata_store.add_documents_metadata([sample_doc2, unbindable])
+    assert not metadata_store._conn_or_raise().in_transaction
+
+    await metadata_store.add_document_metadata(sample_doc1)
+    assert await metadata_store.get_document_metadata(sample_doc2.id) is None
+
+
 @pytest.mark.asyncio
 async def test_list_documents_empty(metadata_store: SQLiteMetadataStore):
     """Test listing documents from an empty store."""
@@ -156,6 +506,11 @@ async def test_list_documents_with_filter_type(
     assert pdf_docs[0].id == sample_doc2.id
     assert pdf_docs[0].document_type == DocumentType.PDF
 
+    pdf_docs_by_value = await metadata_store.list_documents_metadata(
+        filters={"document_type": "pdf", "unknown_column": "ignored"}
+    )
+    assert [doc.id for doc in pdf_docs_by_value] == [sample_doc2.id]
+
 
 @pytest.mark.asyncio
 async def test_list_documents_with_filter_author(
@@ -199,14 +554,7 @@ async def test_list_documents_pagination(
             date_added=datetime.now(timezone.utc),
         ),
     ]
-    for doc_to_add in docs_to_add:
-        existing_doc = await metadata_store.get_document_metadata(doc_to_add.id)
-        if not existing_doc:
-            await metadata_store.add_document_metadata(doc_to_add)
-        else:
-            await metadata_store.update_document_metadata(
-                doc_to_add.id, {"title": doc_to_add.title}
-            )
+    await metadata_store.add_documents_metadata(docs_to_add)
 
     all_docs_sorted_by_id = sorted(docs_to_add, key=lambda d: d.id)
 
@@ -263,6 +611,91 @@ async def test_list_documents_sorting(
     assert sorted_docs_desc[2].title == "Another Test Doc"
 
 
+@pytest.mark.asyncio
+async def test_iter_documents_metadata(
+    metadata_store: SQLiteMetadataStore, sample_doc1: Document, sample_doc2: Document
+):
+    """Test streaming documents matches the listed documents."""
+    await metadata_store.add_documents_metadata([sample_doc1, sample_doc2])
+
+    streamed_ids = [
+        doc.id
+        async for doc in metadata_store.iter_documents_metadata(
+            sort_by="id", sort_order="asc"
+        )
+    ]
+    assert streamed_ids == [sample_doc1.id, sample_doc2.id]
+
+    txt_ids = [
+        doc.id
+        async for doc in metadata_store.iter_documents_metadata(
+            filters={"document_type": DocumentType.TXT}
+        )
+    ]
+    assert txt_ids == [sample_doc1.id]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+async def test_iter_documents_metadata_resumes_across_chunks(
+    metadata_store: SQLiteMetadataStore,
+    monkeypatch: pytest.MonkeyPatch,
+    sort_order: str,
+):
+    """Test that chunked streaming matches a single sorted query, including ties
+    and NULLs in the sort column."""
+    monkeypatch.setattr(
+        "backend.src.implementations.sqlite_metadata_store.ITER_CHUNK_SIZE", 2
+    )
+    authors = ["B", None, "A", "B", None, "A", "C"]
+    await metadata_store.add_documents_metadata(
+        [
+            Document(id=f"doc_{i}", title=f"T{i}", author=author, document_type="txt")
+            for i, author in enumerate(authors)
+        ]
+    )
+    conn = metadata_store._conn_or_raise()
+    order = sort_order.upper()
+    async with conn.execute(
+        f"SELECT id FROM documents ORDER BY author {order}, id {order} LIMIT 5 OFFSET 1"
+    ) as cursor:
+        expected = [row[0] async for row in cursor]
+
+    streamed = [
+        doc.id
+        async for doc in metadata_store.iter_documents_metadata(
+            offset=1, limit=5, sort_by="author", sort_order=sort_order
+        )
+    ]
+    assert streamed == expected
+
+
+@pytest.mark.asyncio
+async def test_iter_documents_metadata_releases_reader_between_chunks(
+    metadata_store: SQLiteMetadataStore, monkeypatch: pytest.MonkeyPatch
+):
+    """Test that as many streaming consumers as there are pooled readers can each
+    do nested reads without deadlocking on the pool."""
+    monkeypatch.setattr(
+        "backend.src.implementations.sqlite_metadata_store.ITER_CHUNK_SIZE", 2
+    )
+    await metadata_store.add_documents_metadata(
+        [Document(id=f"doc_{i}", title=f"T{i}", document_type="txt") for i in range(5)]
+    )
+
+    async def consume() -> int:
+        count = 0
+        async for doc in metadata_store.iter_documents_metadata():
+            assert await metadata_store.get_document_metadata(doc.id) is not None
+            count += 1
+        return count
+
+    counts = await asyncio.wait_for(
+        asyncio.gather(*(consume() for _ in range(READ_POOL_SIZE))), timeout=10
+    )
+    assert counts == [5] * READ_POOL_SIZE
+
+
 @pytest.mark.asyncio
 async def test_update_document(
     metadata_store: SQLiteMetadataStore, sample_doc1: Document
@@ -285,9 +718,7 @@ async def test_update_document(
     assert updated_doc.publication_date == updates["publication_date"]
     assert updated_doc.document_type == updates["document_type"]
     assert updated_doc.file_path == updates["file_path"]
-    assert updated_doc.date_added.replace(
-        microsecond=0
-    ) == sample_doc1.date_added.replace(microsecond=0)
+    assert updated_doc.date_added == sample_doc1.date_added
 
     refetched_doc = await metadata_store.get_document_metadata(sample_doc1.id)
     assert refetched_doc is not None
@@ -322,6 +753,30 @@ async def test_update_with_no_valid_fields(
     assert updated_doc.author == sample_doc1.author
 
 
+@pytest.mark.asyncio
+async def test_update_documents_metadata_batch(
+    metadata_store: SQLiteMetadataStore, sample_doc1: Document, sample_doc2: Document
+):
+    """Test updating several documents, with different fields, in one call."""
+    await metadata_store.add_documents_metadata([sample_doc1, sample_doc2])
+
+    updated_docs = await metadata_store.update_documents_metadata(
+        {
+            sample_doc1.id: {"title": "Alpha Renamed"},
+            sample_doc2.id: {"author": "Author Two Revised", "invalid_field": "x"},
+            "non_existent_id": {"title": "Ghost"},
+        }
+    )
+
+    assert set(updated_docs) == {sample_doc1.id, sample_doc2.id}
+    assert updated_docs[sample_doc1.id].title == "Alpha Renamed"
+    assert updated_docs[sample_doc1.id].author == sample_doc1.author
+    assert updated_docs[sample_doc2.id].author == "Author Two Revised"
+    refetched_doc2 = await metadata_store.get_document_metadata(sample_doc2.id)
+    assert refetched_doc2 is not None
+    assert refetched_doc2.author == "Author Two Revised"
+
+
 @pytest.mark.asyncio
 async def test_delete_document(
     metadata_store: SQLiteMetadataStore, sample_doc1: Document
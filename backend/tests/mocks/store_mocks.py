@@ -1,8 +1,85 @@
-from typing import Any, Dict, List, Optional, Set
+import asyncio
+import heapq
+import math
+import os
+from array import array
+from operator import itemgetter
+from typing import (
+    Any,
+    Collection,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
-from backend.src.interfaces import DocumentStore, MetadataStore, VectorStore
+from pydantic import BaseModel
+
+from backend.src.interfaces import (
+    DocumentStore,
+    MetadataStore,
+    VectorStore,
+    document_id_filter,
+    validate_query,
+)
 from backend.src.models import Document, DocumentType, SearchResult, TextChunk
 
+_ModelT = TypeVar("_ModelT", bound=BaseModel)
+
+# The embedding MockVectorStore gives every text. Embeddings are only read (and
+# copied into packed arrays when stored), so one shared tuple serves all calls.
+_DUMMY_EMBEDDING = (0.1,) * 128
+
+
+# The IDs of the records with one indexed value. A dict used as an ordered set,
+# so records come back in insertion order.
+_Postings = Dict[str, None]
+
+
+def _intersect(postings: List[_Postings]) -> Iterator[str]:
+    # Walk the smallest postings and probe the others
+    smallest, *rest = sorted(postings, key=len)
+    return (
+        record_id for record_id in smallest if all(record_id in ids for ids in rest)
+    )
+
+
+def _is_hashable(value: Any) -> bool:
+    # isinstance(value, Hashable) is not enough: a tuple holding a list passes it
+    # and still fails to hash.
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+def _norm(vector: Sequence[float]) -> float:
+    return math.sqrt(math.sumprod(vector, vector))
+
+
+def _cosine_similarity(
+    query: Sequence[float], query_norm: float, vector: Sequence[float], norm: float
+) -> float:
+    if not query_norm or not norm:
+        return 0.0
+    # sumprod runs the dot product in C and, like zip(strict=True), rejects
+    # vectors of different lengths
+    return math.sumprod(query, vector) / (query_norm * norm)
+
+
+def _apply_updates(model: _ModelT, updates: Dict[str, Any]) -> _ModelT:
+    # Validated from the stored field values rather than model_dump(), which would
+    # serialize every field first. Invalid updates raise ValidationError, as
+    # rebuilding the model did.
+    return type(model).model_validate({**model.__dict__, **updates})
+
 
 class MockDocumentStore(DocumentStore):
     """Mock implementation of DocumentStore for testing purposes."""
@@ -10,6 +87,8 @@ class MockDocumentStore(DocumentStore):
     def __init__(self):
         self.documents_content: Dict[str, bytes] = {}
         self.saved_paths: Set[str] = set()
+        # Next collision suffix per original filename
+        self._name_counts: Dict[str, int] = {}
 
     async def save_document(
         self, file_content: bytes, original_filename: str, document_type: DocumentType
@@ -17,16 +96,16 @@ class MockDocumentStore(DocumentStore):
         # Simulate path generation, e.g., based on document_id or a unique name
         # For mock, let's use original_filename if unique, or add a counter
         file_path = f"mock_store/{original_filename}"
-        # Ensure somewhat unique paths for mock testing if multiple saves happen
-        count = 0
-        while file_path in self.saved_paths:
-            count += 1
-            name, ext = (
-                original_filename.rsplit(".", 1)
-                if "." in original_filename
-                else (original_filename, "")
-            )
-            file_path = f"mock_store/{name}_{count}{'.' + ext if ext else ''}"
+        # Ensure somewhat unique paths for mock testing if multiple saves happen.
+        # The per-name counter resumes where the last collision left off, so
+        # repeated saves of one name don't re-probe every earlier suffix.
+        if file_path in self.saved_paths:
+            name, ext = os.path.splitext(original_filename)
+            count = self._name_counts.get(original_filename, 0)
+            while file_path in self.saved_paths:
+                count += 1
+                file_path = f"mock_store/{name}_{count}{ext}"
+            self._name_counts[original_filename] = count
 
         self.documents_content[file_path] = file_content
         self.saved_paths.add(file_path)
@@ -51,13 +130,54 @@ class MockDocumentStore(DocumentStore):
 class MockMetadataStore(MetadataStore):
     """Mock implementation of MetadataStore for testing purposes."""
 
+    # Fields with an inverted index for equality filters in list_documents_metadata
+    INDEXED_FIELDS = ("document_type", "author")
+
     def __init__(self):
         self.metadata: Dict[str, Document] = {}
+        # field -> value -> postings of the documents with that value
+        self._index: Dict[str, Dict[Any, _Postings]] = {
+            field: {} for field in self.INDEXED_FIELDS
+        }
 
-    async def add_document_metadata(self, document: Document) -> None:
+    def _store(self, document: Document) -> None:
+        previous = self.metadata.get(document.id)
+        if previous is not None:
+            self._unindex(previous)
         self.metadata[document.id] = document
+        for field, postings in self._index.items():
+            postings.setdefault(getattr(document, field), {})[document.id] = None
+
+    def _unindex(self, document: Document) -> None:
+        for field, postings in self._index.items():
+            value = getattr(document, field)
+            ids = postings.get(value)
+            if ids is not None:
+                ids.pop(document.id, None)
+                if not ids:
+                    del postings[value]
+
+    def _filter(self, filters: Dict[str, Any]) -> List[Document]:
+        if all(
+            key in self._index and _is_hashable(value) for key, value in filters.items()
+        ):
+            postings = [
+                self._index[key].get(value, {}) for key, value in filters.items()
+            ]
+            return [self.metadata[doc_id] for doc_id in _intersect(postings)]
+        results = list(self.metadata.values())
+        for key, value in filters.items():
+            results = [doc for doc in results if getattr(doc, key, None) == value]
+        return results
+
+    async def add_document_metadata(self, document: Document) -> None:
+        self._store(document)
         # print(f"MockMetadataStore: Added metadata for doc ID {document.id}")
 
+    async def add_documents_metadata(self, documents: Sequence[Document]) -> None:
+        for document in documents:
+            self._store(document)
+
     async def get_document_metadata(self, document_id: str) -> Optional[Document]:
         # print(f"MockMetadataStore: Getting metadata for doc ID {document_id}")
         return self.metadata.get(document_id)
@@ -71,31 +191,25 @@ class MockMetadataStore(MetadataStore):
         sort_order: str = "desc",
     ) -> List[Document]:
         # print(f"MockMetadataStore: Listing metadata with filters: {filters}")
-        results = list(self.metadata.values())
-        # Basic filtering (can be expanded)
-        if filters:
-            for key, value in filters.items():
-                results = [doc for doc in results if getattr(doc, key, None) == value]
-
-        # Basic sorting (can be expanded)
-        if sort_by:
-            results.sort(
-                key=lambda doc: getattr(doc, sort_by, None),
-                reverse=(sort_order == "desc"),
-            )
+        # Equality filters on indexed fields avoid scanning every document
+        results = self._filter(filters) if filters else list(self.metadata.values())
 
-        return results[offset : offset + limit]
+        if not sort_by:
+            return results[offset : offset + limit]
+        # Only the first offset + limit documents of the order are needed, so
+        # select them with a bounded heap instead of sorting everything. Same
+        # result (and tie order) as sort + slice.
+        pick = heapq.nlargest if sort_order == "desc" else heapq.nsmallest
+        top = pick(offset + limit, results, key=lambda doc: getattr(doc, sort_by, None))
+        return top[offset:]
 
     async def update_document_metadata(
         self, document_id: str, updates: Dict[str, Any]
     ) -> Optional[Document]:
         if document_id in self.metadata:
             doc = self.metadata[document_id]
-            updated_doc_data = doc.model_dump().copy()
-            updated_doc_data.update(updates)
-            # Re-validate with Pydantic model
             try:
-                self.metadata[document_id] = Document(**updated_doc_data)
+                self._store(_apply_updates(doc, updates))
                 # print(f"MockMetadataStore: Updated metadata for doc ID {document_id}")
                 return self.metadata[document_id]
             except Exception:  # Could be pydantic.ValidationError
@@ -104,114 +218,272 @@ class MockMetadataStore(MetadataStore):
 
     async def delete_document_metadata(self, document_id: str) -> bool:
         if document_id in self.metadata:
-            del self.metadata[document_id]
+            self._unindex(self.metadata.pop(document_id))
             # print(f"MockMetadataStore: Deleted metadata for doc ID {document_id}")
             return True
         return False
 
 
+class _ChunkRec:
+    """The fields of a stored TextChunk, without the pydantic model overhead."""
+
+    __slots__ = ("id", "document_id", "text", "metadata")
+
+    def __init__(
+        self, id: str, document_id: str, text: str, metadata: Dict[str, Any]
+    ) -> None:
+        self.id = id
+        self.document_id = document_id
+        self.text = text
+        self.metadata = metadata
+
+    @classmethod
+    def from_chunk(cls, chunk: TextChunk) -> "_ChunkRec":
+        # The record keeps its own copy of the metadata, so the index built from
+        # it can't be invalidated by the caller mutating the chunk's dict.
+        return cls(chunk.id, chunk.document_id, chunk.text, dict(chunk.metadata))
+
+    def to_chunk(self) -> TextChunk:
+        # Records are only built by from_chunk(), so their fields are a valid chunk
+        return TextChunk.model_construct(
+            id=self.id,
+            document_id=self.document_id,
+            text=self.text,
+            metadata=dict(self.metadata),
+        )
+
+
 class MockVectorStore(VectorStore):
     """Mock implementation of VectorStore for testing purposes."""
 
-    def __init__(self):
-        self.chunks: Dict[str, TextChunk] = {}
-        self.embeddings: Dict[str, List[float]] = {}
+    def __init__(self, embedding_batch_size: int = 512):
+        self.chunks: Dict[str, _ChunkRec] = {}
+        # Packed float32 arrays rather than lists of boxed Python floats
+        self.embeddings: Dict[str, array[float]] = {}
+        self.embedding_batch_size = embedding_batch_size
+        self.embedding_calls = 0  # Simulated embedding provider requests
+        # chunk ID -> (embedding, its norm); the norm is recomputed whenever the
+        # chunk's embedding is replaced by a different array
+        self._norms: Dict[str, Tuple[array[float], float]] = {}
+        # document ID -> postings of its chunks
+        self._chunks_by_document: Dict[str, _Postings] = {}
+        # metadata key -> value -> postings of the chunks with that value
+        self._metadata_index: Dict[str, Dict[Any, _Postings]] = {}
         # print("MockVectorStore initialized")
 
+    def _store_chunk(self, record: _ChunkRec) -> None:
+        previous = self.chunks.get(record.id)
+        if previous is not None:
+            self._unindex_chunk(previous)
+        self.chunks[record.id] = record
+        self._chunks_by_document.setdefault(record.document_id, {})[record.id] = None
+        for key, value in record.metadata.items():
+            if _is_hashable(value):
+                values = self._metadata_index.setdefault(key, {})
+                values.setdefault(value, {})[record.id] = None
+
+    def _unindex_chunk(self, record: _ChunkRec) -> None:
+        document_chunks = self._chunks_by_document[record.document_id]
+        del document_chunks[record.id]
+        if not document_chunks:
+            del self._chunks_by_document[record.document_id]
+        for key, value in record.metadata.items():
+            if not _is_hashable(value):
+                continue
+            values = self._metadata_index[key]
+            ids = values[value]
+            del ids[record.id]
+            if not ids:
+                del values[value]
+                if not values:
+                    del self._metadata_index[key]
+
+    async def _embed_batch(self, texts: List[str]) -> List[Sequence[float]]:
+        # Simulates a single embedding provider request for a whole batch
+        self.embedding_calls += 1
+        return [_DUMMY_EMBEDDING] * len(texts)
+
     async def add_text_chunks(self, chunks_to_add: List[TextChunk]) -> List[str]:
+        batch_size = self.embedding_batch_size
+        batches = [
+            chunks_to_add[start : start + batch_size]
+            for start in range(0, len(chunks_to_add), batch_size)
+        ]
+        batch_embeddings = await asyncio.gather(
+            *(self._embed_batch([chunk.text for chunk in batch]) for batch in batches)
+        )
         added_ids = []
-        for chunk in chunks_to_add:
-            self.chunks[chunk.id] = chunk
-            # Simulate embedding generation if not present
-            self.embeddings[chunk.id] = [0.1] * 128  # Dummy embedding
-            added_ids.append(chunk.id)
+        for batch, embeddings in zip(batches, batch_embeddings, strict=True):
+            for chunk, embedding in zip(batch, embeddings, strict=True):
+                self._store_chunk(_ChunkRec.from_chunk(chunk))
+                self.embeddings[chunk.id] = array("f", embedding)
+                added_ids.append(chunk.id)
         # print(f"MockVectorStore: Added chunks with IDs: {added_ids}")
         return added_ids
 
     async def search_similar_chunks(
         self,
         query_text: Optional[str] = None,
-        query_embedding: Optional[List[float]] = None,
+        query_embedding: Optional[Sequence[float]] = None,
         top_k: int = 5,
-        document_ids: Optional[List[str]] = None,
+        document_ids: Optional[Collection[str]] = None,
         metadata_filter: Optional[Dict[str, Any]] = None,
     ) -> List[SearchResult]:
-        if not query_text and not query_embedding:
-            raise ValueError("Either query_text or query_embedding must be provided.")
-        if query_text and query_embedding:
-            raise ValueError("Provide either query_text or query_embedding, not both.")
-
-        # Mock search: return some chunks, possibly filtered
-        # This is a very simplistic mock. Real tests would need sophisticated matching.
-        results: List[SearchResult] = []
-        candidate_chunks = list(self.chunks.values())
-
-        if document_ids:
-            candidate_chunks = [
-                c for c in candidate_chunks if c.document_id in document_ids
+        validate_query(query_text, query_embedding)
+
+        if query_text:
+            query_vector: Sequence[float] = (await self._embed_batch([query_text]))[0]
+        else:
+            assert query_embedding is not None
+            query_vector = query_embedding
+        return self._search(
+            query_vector, self._candidates(document_ids, metadata_filter), top_k
+        )
+
+    async def search_similar_chunks_batch(
+        self,
+        queries: Sequence[Union[str, Sequence[float]]],
+        top_k: int = 5,
+        document_ids: Optional[Collection[str]] = None,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+    ) -> List[List[SearchResult]]:
+        if any(len(query) == 0 for query in queries):
+            raise ValueError("Queries must be non-empty texts or embeddings.")
+        # All text queries are embedded together and the filters applied once
+        texts = [query for query in queries if isinstance(query, str)]
+        text_vectors = iter(await self._embed_batch(texts) if texts else [])
+        candidates = list(self._candidates(document_ids, metadata_filter))
+        return [
+            self._search(
+                next(text_vectors) if isinstance(query, str) else query,
+                candidates,
+                top_k,
+            )
+            for query in queries
+        ]
+
+    def _candidates(
+        self,
+        document_ids: Optional[Collection[str]],
+        metadata_filter: Optional[Dict[str, Any]],
+    ) -> Iterable[_ChunkRec]:
+        candidate_chunks: Iterable[_ChunkRec] = self.chunks.values()
+        id_filter = document_id_filter(document_ids) if document_ids else None
+        filter_items = list(metadata_filter.items()) if metadata_filter else []
+
+        if filter_items and all(
+            value is not None and _is_hashable(value) for _, value in filter_items
+        ):
+            # None is left to the scan, where it also matches missing keys
+            postings = [
+                self._metadata_index.get(key, {}).get(value, {})
+                for key, value in filter_items
             ]
+            candidate_chunks = (
+                self.chunks[chunk_id] for chunk_id in _intersect(postings)
+            )
+            filter_items = []
+        elif id_filter is not None:
+            # Only visit the chunks of the requested documents (in a fixed
+            # order, so ties between equal scores resolve the same every run)
+            by_document = self._chunks_by_document
+            candidate_chunks = (
+                self.chunks[chunk_id]
+                for document_id in sorted(id_filter)
+                for chunk_id in by_document.get(document_id, {})
+            )
+            id_filter = None
 
-        # Basic metadata filtering (can be expanded)
-        if metadata_filter:
-            temp_candidates = []
-            for chunk in candidate_chunks:
-                match = True
-                for key, value in metadata_filter.items():
-                    if chunk.metadata.get(key) != value:
-                        match = False
-                        break
-                if match:
-                    temp_candidates.append(chunk)
-            candidate_chunks = temp_candidates
-
-        for chunk in candidate_chunks:
-            if len(results) < top_k:
-                results.append(
-                    SearchResult(
-                        chunk_id=chunk.id,
-                        document_id=chunk.document_id,
-                        text=chunk.text,
-                        score=0.8,  # Dummy score
-                        chunk_metadata=chunk.metadata,
-                    )
-                )
-            else:
-                break
-        return results
+        if filter_items:
+            candidate_chunks = (
+                c
+                for c in candidate_chunks
+                if all(c.metadata.get(key) == value for key, value in filter_items)
+            )
+        if id_filter is not None:
+            candidate_chunks = (
+                c for c in candidate_chunks if c.document_id in id_filter
+            )
+        return candidate_chunks
 
-    async def delete_document_chunks(self, document_id: str) -> bool:
-        chunks_to_delete = [
-            cid
-            for cid, chunk in self.chunks.items()
-            if chunk.document_id == document_id
+    def _search(
+        self,
+        query_vector: Sequence[float],
+        candidates: Iterable[_ChunkRec],
+        top_k: int,
+    ) -> List[SearchResult]:
+        # Brute-force cosine similarity against every candidate, like a flat index,
+        # so the mock costs what a real scan would. nlargest keeps a top_k heap
+        # instead of sorting all scores, and keeps insertion order among ties.
+        query_norm = _norm(query_vector)
+        embeddings = self.embeddings
+        scored = (
+            (
+                _cosine_similarity(
+                    query_vector,
+                    query_norm,
+                    embeddings[c.id],
+                    self._embedding_norm(c.id, embeddings[c.id]),
+                ),
+                c,
+            )
+            for c in candidates
+        )
+        # Each result copies a stored record and a float score, nothing to coerce
+        return [
+            SearchResult.model_construct(
+                chunk_id=chunk.id,
+                document_id=chunk.document_id,
+                text=chunk.text,
+                score=score,
+                chunk_metadata=dict(chunk.metadata),
+            )
+            for score, chunk in heapq.nlargest(top_k, scored, key=itemgetter(0))
         ]
-        if not chunks_to_delete:
-            return True  # No chunks for this doc, considered success
-        deleted_count = 0
-        for chunk_id in chunks_to_delete:
-            if chunk_id in self.chunks:
-                del self.chunks[chunk_id]
-                if chunk_id in self.embeddings:
-                    del self.embeddings[chunk_id]
-                deleted_count += 1
-
-        return deleted_count > 0 or not chunks_to_delete
+
+    def _embedding_norm(self, chunk_id: str, embedding: array[float]) -> float:
+        # Stored vectors are normalised once rather than on every search
+        cached = self._norms.get(chunk_id)
+        if cached is not None and cached[0] is embedding:
+            return cached[1]
+        norm = _norm(embedding)
+        self._norms[chunk_id] = (embedding, norm)
+        return norm
+
+    async def delete_document_chunks(self, document_id: str) -> bool:
+        # No chunks for the document is also considered success
+        for chunk_id in list(self._chunks_by_document.get(document_id, ())):
+            self._unindex_chunk(self.chunks.pop(chunk_id))
+            self.embeddings.pop(chunk_id, None)
+            self._norms.pop(chunk_id, None)
+        return True
 
     async def get_text_chunk(self, chunk_id: str) -> Optional[TextChunk]:
-        return self.chunks.get(chunk_id)
+        record = self.chunks.get(chunk_id)
+        return record.to_chunk() if record is not None else None
+
+    async def get_text_chunks_batch(
+        self, chunk_ids: Sequence[str]
+    ) -> Dict[str, TextChunk]:
+        chunks = self.chunks
+        return {
+            chunk_id: chunks[chunk_id].to_chunk()
+            for chunk_id in chunk_ids
+            if chunk_id in chunks
+        }
 
     async def update_text_chunk(
         self, chunk_id: str, updates: Dict[str, Any]
     ) -> Optional[TextChunk]:
         if chunk_id in self.chunks:
-            chunk = self.chunks[chunk_id]
-            updated_data = chunk.model_dump().copy()
-            updated_data.update(updates)
+            chunk = self.chunks[chunk_id].to_chunk()
             try:
-                self.chunks[chunk_id] = TextChunk(**updated_data)
+                updated_chunk = _apply_updates(chunk, updates)
+                self._store_chunk(_ChunkRec.from_chunk(updated_chunk))
                 if "text" in updates:  # Simulate re-embedding if text changes
-                    self.embeddings[chunk_id] = [0.2] * 128  # New dummy embedding
-                return self.chunks[chunk_id]
+                    # New dummy embedding
+                    self.embeddings[chunk_id] = array("f", [0.2] * 128)
+                return updated_chunk
             except Exception:
                 return None
         return None
@@ -10,19 +10,11 @@ TEST_DB_NAME = "test_metadata.db"
 
 
 @pytest.fixture
-def app_instance():
+def app_instance(tmp_path):
     """Create and configure a new app instance for each test."""
-    base_dir = os.path.abspath(
-        os.path.join(os.path.dirname(__file__), "..")
-    )  # Should point to backend/
-    instance_folder = os.path.join(base_dir, "instance")
-    if not os.path.exists(instance_folder):
-        os.makedirs(instance_folder)
-
-    test_db_path = os.path.join(instance_folder, TEST_DB_NAME)
-
-    if os.path.exists(test_db_path):
-        os.remove(test_db_path)
+    # A fresh database file per test, under pytest's temporary directory, so
+    # tests neither share state through backend/instance nor need to clean up.
+    test_db_path = os.path.join(tmp_path, TEST_DB_NAME)
 
     flask_app.config.update(
         {
@@ -36,10 +28,6 @@ def app_instance():
     with flask_app.app_context():
         yield flask_app  # Provide the configured app
 
-    # Teardown: remove the temporary database file
-    if os.path.exists(test_db_path):
-        os.remove(test_db_path)
-
 
 @pytest.fixture
 def client(app_instance):
@@ -85,19 +73,25 @@ def test_get_db_connection_after_init(app_instance):
     # init_db uses app.config which is set up by app_instance
     init_db()
 
-    conn = None
-    try:
-        conn = get_db_connection()
-        assert isinstance(
-            conn, sqlite3.Connection
-        ), "Should return a sqlite3.Connection."
+    # The connection is closed by the app context's teardown, not here.
+    conn = get_db_connection()
+    assert isinstance(
+        conn, sqlite3.Connection
+    ), "Should return a sqlite3.Connection."
+    assert get_db_connection() is conn, "Should reuse the context's connection."
 
-        cursor = conn.cursor()
-        cursor.execute("SELECT 1")
-        assert cursor.fetchone() is not None, "Query should succeed."
-    finally:
-        if conn:
-            conn.close()
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1")
+    assert cursor.fetchone() is not None, "Query should succeed."
+
+
+def test_get_db_connection_is_reused_within_app_context(app_instance):
+    """Test that get_db_connection returns one connection per app context."""
+    init_db()
+
+    conn = get_db_connection()
+    assert get_db_connection() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
 
 
 def test_init_db_function_directly(app_instance):
@@ -115,3 +109,29 @@ def test_init_db_function_directly(app_instance):
     table_exists = cursor.fetchone()
     conn.close()
     assert table_exists is not None, "Table 'documents' should be created."
+
+
+def test_init_db_rebuilds_legacy_table(app_instance):
+    """Test that init_db converts a table from older versions, keeping its rows."""
+    db_path = app_instance.config["SQLALCHEMY_DATABASE_URI"].replace("sqlite:///", "")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE documents (id TEXT PRIMARY KEY, title TEXT NOT NULL, "
+            "author TEXT, pub_date TEXT, doc_type TEXT NOT NULL, "
+            "date_added TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP, "
+            "file_path TEXT NOT NULL)"
+        )
+        conn.execute(
+            "INSERT INTO documents (id, title, doc_type, file_path) "
+            "VALUES ('doc_1', 'Title', 'pdf', 'doc_1.pdf')"
+        )
+    conn.close()
+
+    init_db()
+
+    conn = sqlite3.connect(db_path)
+    table_info = conn.execute("PRAGMA table_list('documents')").fetchone()
+    titles = conn.execute("SELECT title FROM documents").fetchall()
+    conn.close()
+    assert table_info[4] == 1 and table_info[5] == 1, "Should be STRICT, WITHOUT ROWID."
+    assert titles == [("Title",)]
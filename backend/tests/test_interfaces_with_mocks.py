@@ -1,3 +1,6 @@
+import math
+from array import array
+
 import pytest
 
 from backend.src.interfaces import (  # For type hinting
@@ -125,6 +128,29 @@ async def test_mock_metadata_store_add_get_list_delete(
     retrieved_updated_doc1 = await mock_meta_store.get_document_metadata("doc_001")
     assert retrieved_updated_doc1.title == "Document Alpha (Updated)"
 
+    # Enum fields given as strings are still coerced
+    updated_doc = await mock_meta_store.update_document_metadata(
+        "doc_001", {"document_type": "txt", "unknown_field": 1}
+    )
+    assert updated_doc is not None
+    assert updated_doc.document_type is DocumentType.TXT
+    assert not hasattr(updated_doc, "unknown_field")
+    assert (
+        await mock_meta_store.update_document_metadata(
+            "doc_001", {"document_type": "exe"}
+        )
+        is None
+    )
+    # Invalid values for other fields are rejected too, leaving the document as is
+    assert (
+        await mock_meta_store.update_document_metadata(
+            "doc_001", {"title": None, "date_added": "yesterday"}
+        )
+        is None
+    )
+    retrieved_doc1 = await mock_meta_store.get_document_metadata("doc_001")
+    assert retrieved_doc1.title == "Document Alpha (Updated)"
+
     # Delete
     assert await mock_meta_store.delete_document_metadata("doc_001") is True
     assert len(mock_meta_store.metadata) == 1
@@ -133,6 +159,36 @@ async def test_mock_metadata_store_add_get_list_delete(
     )  # Non-existent
 
 
+@pytest.mark.asyncio
+async def test_mock_metadata_store_indexed_filters(
+    mock_meta_store: MockMetadataStore,
+):
+    """Tests that equality filters served by the index track adds, updates and
+    deletes."""
+    await mock_meta_store.add_documents_metadata(
+        [
+            Document(id="a", title="A", author="Ann", document_type=DocumentType.PDF),
+            Document(id="b", title="B", author="Bob", document_type=DocumentType.PDF),
+            Document(id="c", title="C", author="Ann", document_type=DocumentType.TXT),
+        ]
+    )
+
+    docs = await mock_meta_store.list_documents_metadata(
+        filters={"author": "Ann", "document_type": DocumentType.PDF}
+    )
+    assert [doc.id for doc in docs] == ["a"]
+
+    # The index follows updates and deletes
+    await mock_meta_store.update_document_metadata("b", {"author": "Ann"})
+    await mock_meta_store.delete_document_metadata("a")
+    docs = await mock_meta_store.list_documents_metadata(filters={"author": "Ann"})
+    assert sorted(doc.id for doc in docs) == ["b", "c"]
+
+    # Filters on non-indexed fields fall back to a scan
+    docs = await mock_meta_store.list_documents_metadata(filters={"title": "C"})
+    assert [doc.id for doc in docs] == ["c"]
+
+
 @pytest.mark.asyncio
 async def test_mock_vector_store_add_search_delete(mock_vec_store: MockVectorStore):
     """Tests add, search, and delete operations for MockVectorStore."""
@@ -183,6 +239,11 @@ async def test_mock_vector_store_add_search_delete(mock_vec_store: MockVectorSto
     assert all(res.document_id == "doc_2" for res in doc2_results)
     assert len(doc2_results) == 1  # chunk_2_1
 
+    set_results = await mock_vec_store.search_similar_chunks(
+        query_text="anything", document_ids={"doc_1", "doc_2"}
+    )
+    assert len(set_results) == 3
+
     # Update chunk
     updated_chunk = await mock_vec_store.update_text_chunk(
         "chunk_1_1", {"text": "Updated text about apples and pears"}
@@ -191,6 +252,9 @@ async def test_mock_vector_store_add_search_delete(mock_vec_store: MockVectorSto
     assert updated_chunk.text == "Updated text about apples and pears"
     retrieved_updated_chunk = await mock_vec_store.get_text_chunk("chunk_1_1")
     assert retrieved_updated_chunk.text == "Updated text about apples and pears"
+    assert await mock_vec_store.update_text_chunk("chunk_1_1", {"text": 5}) is None
+    retrieved_updated_chunk = await mock_vec_store.get_text_chunk("chunk_1_1")
+    assert retrieved_updated_chunk.text == "Updated text about apples and pears"
 
     # Delete document chunks
     assert await mock_vec_store.delete_document_chunks("doc_1") is True
@@ -202,3 +266,164 @@ async def test_mock_vector_store_add_search_delete(mock_vec_store: MockVectorSto
     assert (
         await mock_vec_store.delete_document_chunks("doc_non_existent") is True
     )  # Should be true if no chunks
+
+
+@pytest.mark.asyncio
+async def test_mock_vector_store_embeds_in_batches():
+    store = MockVectorStore(embedding_batch_size=2)
+    chunks = [
+        TextChunk(id=f"chunk_{i}", document_id="doc_1", text=f"Chunk {i}")
+        for i in range(5)
+    ]
+    added_ids = await store.add_text_chunks(chunks)
+    assert added_ids == [chunk.id for chunk in chunks]
+    assert store.embedding_calls == 3  # Batches of 2, 2 and 1 chunks
+    assert set(store.embeddings) == set(added_ids)
+    assert all(embedding.typecode == "f" for embedding in store.embeddings.values())
+
+
+@pytest.mark.asyncio
+async def test_mock_vector_store_accepts_array_query_embedding(
+    mock_vec_store: MockVectorStore,
+):
+    await mock_vec_store.add_text_chunks(
+        [TextChunk(id="chunk_1", document_id="doc_1", text="Some text")]
+    )
+    results = await mock_vec_store.search_similar_chunks(
+        query_embedding=array("f", [0.1] * 128), top_k=1
+    )
+    assert [result.chunk_id for result in results] == ["chunk_1"]
+    with pytest.raises(ValueError):
+        await mock_vec_store.search_similar_chunks(query_embedding=array("f"))
+
+
+@pytest.mark.asyncio
+async def test_mock_vector_store_search_batch(mock_vec_store: MockVectorStore):
+    await mock_vec_store.add_text_chunks(
+        [
+            TextChunk(id="chunk_1", document_id="doc_1", text="About apples"),
+            TextChunk(id="chunk_2", document_id="doc_2", text="About pears"),
+        ]
+    )
+    results = await mock_vec_store.search_similar_chunks_batch(
+        ["apples", [0.1] * 128], top_k=5, document_ids=["doc_2"]
+    )
+    assert len(results) == 2
+    for query_results in results:
+        assert [result.chunk_id for result in query_results] == ["chunk_2"]
+    with pytest.raises(ValueError):
+        await mock_vec_store.search_similar_chunks_batch(["apples", ""])
+
+
+@pytest.mark.asyncio
+async def test_mock_vector_store_ranks_by_cosine_similarity(
+    mock_vec_store: MockVectorStore,
+):
+    await mock_vec_store.add_text_chunks(
+        [
+            TextChunk(id=f"chunk_{i}", document_id="doc_1", text=f"Chunk {i}")
+            for i in range(3)
+        ]
+    )
+    mock_vec_store.embeddings["chunk_0"] = array("f", [1.0, 0.0])
+    mock_vec_store.embeddings["chunk_1"] = array("f", [0.0, 1.0])
+    mock_vec_store.embeddings["chunk_2"] = array("f", [1.0, 1.0])
+
+    results = await mock_vec_store.search_similar_chunks(
+        query_embedding=[0.0, 2.0], top_k=2
+    )
+    assert [result.chunk_id for result in results] == ["chunk_1", "chunk_2"]
+    assert results[0].score == pytest.approx(1.0)
+    assert results[1].score == pytest.approx(math.sqrt(0.5))
+
+
+@pytest.mark.asyncio
+async def test_mock_vector_store_get_text_chunks_batch(
+    mock_vec_store: MockVectorStore,
+):
+    """Tests fetching several chunks in one call."""
+    chunks = [
+        TextChunk(id=f"chunk_{i}", document_id="doc_1", text=f"Chunk {i}")
+        for i in range(3)
+    ]
+    await mock_vec_store.add_text_chunks(chunks)
+
+    fetched = await mock_vec_store.get_text_chunks_batch(
+        ["chunk_2", "missing", "chunk_0"]
+    )
+    assert fetched == {"chunk_2": chunks[2], "chunk_0": chunks[0]}
+    assert await mock_vec_store.get_text_chunks_batch([]) == {}
+
+
+@pytest.mark.asyncio
+async def test_mock_vector_store_metadata_filter(mock_vec_store: MockVectorStore):
+    """Tests metadata filtering, which is served by an inverted index."""
+    await mock_vec_store.add_text_chunks(
+        [
+            TextChunk(id="c1", document_id="d1", text="a", metadata={"page": 1}),
+            TextChunk(id="c2", document_id="d1", text="b", metadata={"page": 2}),
+            TextChunk(id="c3", document_id="d2", text="c", metadata={"page": 1}),
+        ]
+    )
+
+    async def search(**kwargs):
+        results = await mock_vec_store.search_similar_chunks(
+            query_text="query", **kwargs
+        )
+        return sorted(result.chunk_id for result in results)
+
+    assert await search(metadata_filter={"page": 1}) == ["c1", "c3"]
+    assert await search(metadata_filter={"page": 1}, document_ids=["d2"]) == ["c3"]
+    assert await search(metadata_filter={"page": 3}) == []
+
+    # The index follows updates and deletes
+    await mock_vec_store.update_text_chunk("c2", {"metadata": {"page": 1}})
+    await mock_vec_store.delete_document_chunks("d2")
+    assert await search(metadata_filter={"page": 1}) == ["c1", "c2"]
+
+
+@pytest.mark.asyncio
+async def test_mock_vector_store_index_survives_caller_mutation(
+    mock_vec_store: MockVectorStore,
+):
+    """Tests that mutating metadata after adding a chunk can't corrupt the index,
+    and that values which only look hashable are still accepted."""
+    metadata = {"page": 1, "span": (0, [1, 2])}
+    await mock_vec_store.add_text_chunks(
+        [TextChunk(id="c1", document_id="d1", text="a", metadata=metadata)]
+    )
+    metadata["page"] = 2
+    fetched = await mock_vec_store.get_text_chunk("c1")
+    fetched.metadata["page"] = 3
+
+    results = await mock_vec_store.search_similar_chunks(
+        query_text="query", metadata_filter={"page": 1}
+    )
+    assert [result.chunk_id for result in results] == ["c1"]
+    assert await mock_vec_store.delete_document_chunks("d1") is True
+    assert "c1" not in mock_vec_store.chunks
+
+
+@pytest.mark.asyncio
+async def test_mock_vector_store_requires_exactly_one_query(
+    mock_vec_store: MockVectorStore,
+):
+    with pytest.raises(ValueError):
+        await mock_vec_store.search_similar_chunks()
+    with pytest.raises(ValueError):
+        await mock_vec_store.search_similar_chunks(
+            query_text="apples", query_embedding=[0.1] * 128
+        )
+
+
+@pytest.mark.asyncio
+async def test_mock_store_methods_can_be_patched_per_instance(
+    mock_meta_store: MockMetadataStore, monkeypatch: pytest.MonkeyPatch
+):
+    """Tests that tests can replace a mock's methods on the instance."""
+
+    async def no_documents(*args, **kwargs):
+        return []
+
+    monkeypatch.setattr(mock_meta_store, "list_documents_metadata", no_documents)
+    assert await mock_meta_store.list_documents_metadata() == []
@@ -16,6 +16,13 @@ def test_document_type_enum():
     assert DocumentType.MD == "md"
 
 
+def test_document_type_from_value():
+    assert DocumentType.from_value("pdf") is DocumentType.PDF
+    assert DocumentType.from_value("md") is DocumentType.MD
+    with pytest.raises(ValueError):
+        DocumentType.from_value("exe")
+
+
 def test_document_creation_valid():
     """Tests successful creation of a Document model with valid data."""
     now = datetime.now(timezone.utc)
@@ -61,9 +68,30 @@ def test_document_creation_minimal():
     assert doc.file_path is None
     assert doc.source is None
     assert isinstance(doc.date_added, datetime)
+    assert doc.date_added.tzinfo == timezone.utc
     assert doc.metadata == {}
 
 
+def test_document_date_added_us():
+    doc = Document(
+        id="doc_us",
+        title="Epoch Doc",
+        document_type=DocumentType.TXT,
+        date_added=datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+    )
+    assert doc.date_added_us == 1704164645678901
+    naive_doc = doc.model_copy(
+        update={"date_added": datetime(2024, 1, 2, 3, 4, 5, 678901)}
+    )
+    assert naive_doc.date_added_us == doc.date_added_us
+
+
+def test_document_is_frozen():
+    doc = Document(id="doc_frozen", title="Frozen", document_type=DocumentType.TXT)
+    with pytest.raises(ValidationError):
+        doc.title = "Changed"  # type: ignore[misc]
+
+
 def test_document_validation_error_missing_required():
     """Tests Pydantic ValidationError when required fields are missing for Document."""
     with pytest.raises(ValidationError) as excinfo: